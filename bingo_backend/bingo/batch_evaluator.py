@@ -0,0 +1,96 @@
+# bingo/batch_evaluator.py
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the engine falls back to per-card bitmasks
+    np = None
+
+from .card_state import PATTERN_MASKS, FREE_POSITION
+
+
+def is_available():
+    return np is not None
+
+
+class BatchWinnerEvaluator:
+    """Vectorized winner detection over every card of a round.
+
+    Cards are held as an (N, 25) number matrix and their marks as an
+    (N, 25) boolean matrix, both indexed by flat position (row * 5 + col).
+    A single matrix product against the (14, 25) pattern matrix gives the
+    pattern hits of every card at once.
+    """
+
+    def __init__(self, selection_ids, flats):
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+
+        self.selection_ids = list(selection_ids)
+        self.rows = {selection_id: i for i, selection_id in enumerate(self.selection_ids)}
+
+        count = len(self.selection_ids)
+        # Catalogue flats are already normalized, invalid cells are 0
+        self.numbers = np.array(
+            [flats[selection_id] for selection_id in self.selection_ids], dtype=np.int16
+        ).reshape(count, 25)
+
+        self.marks = np.zeros((count, 25), dtype=bool)
+
+        self.pattern_names = [name for name, _, _ in PATTERN_MASKS]
+        self.pattern_positions = [positions for _, _, positions in PATTERN_MASKS]
+        self.patterns = np.zeros((len(PATTERN_MASKS), 25), dtype=np.int16)
+        for i, positions in enumerate(self.pattern_positions):
+            self.patterns[i, list(positions)] = 1
+        self.pattern_sizes = self.patterns.sum(axis=1)
+
+    @classmethod
+    def from_round_state(cls, state):
+        evaluator = cls(state.cards.keys(), state.flats)
+        for selection_id, card_state in state.cards.items():
+            evaluator.set_marks(selection_id, card_state.positions)
+        return evaluator
+
+    def __len__(self):
+        return len(self.selection_ids)
+
+    def set_marks(self, selection_id, positions):
+        row = self.rows.get(selection_id)
+        if row is not None and positions:
+            self.marks[row, list(positions)] = True
+
+    def mark_position(self, selection_id, position):
+        row = self.rows.get(selection_id)
+        if row is not None:
+            self.marks[row, position] = True
+
+    def pattern_hits(self, rows=None):
+        """(N, 14) boolean matrix of completed patterns, FREE position counted as marked"""
+        marks = self.marks[rows] if rows is not None else self.marks.copy()
+        marks[:, FREE_POSITION] = True
+        return marks.astype(np.int16) @ self.patterns.T == self.pattern_sizes
+
+    def find_winners(self, selection_ids=None):
+        """Return {selection_id: {pattern_name: {'positions': [...], 'numbers': [...]}}}
+
+        Only the given selections are evaluated, all of them when None.
+        """
+        if selection_ids is None:
+            rows = np.arange(len(self.selection_ids))
+        else:
+            rows = np.array([self.rows[s] for s in selection_ids if s in self.rows], dtype=np.intp)
+
+        hits = self.pattern_hits(rows)
+        winners = {}
+
+        for i in np.flatnonzero(hits.any(axis=1)):
+            row = rows[i]
+            selection_id = self.selection_ids[row]
+            patterns = {}
+            for p in np.flatnonzero(hits[i]):
+                positions = list(self.pattern_positions[p])
+                patterns[self.pattern_names[p]] = {
+                    'positions': positions,
+                    'numbers': [int(n) for n in self.numbers[row, positions]],
+                }
+            winners[selection_id] = patterns
+
+        return winners
@@ -1,122 +1,222 @@
 # bingo/cache_manager.py
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import weakref
+
+from .local_cache import LocalCache
+
+try:
+    from django_redis import get_redis_connection
+except ImportError:  # Pub/sub needs django-redis, the local tier then relies on its TTL alone
+    get_redis_connection = None
+
+# Redis pub/sub channel carrying the keys every process drops from its local tier
+INVALIDATION_CHANNEL = 'bingo_cache_invalidation'
+
+# Seconds between two logged broadcast failures, Redis being down would log every write
+BROADCAST_ERROR_LOG_INTERVAL = 60
 
 class BingoCacheManager:
-    """Centralized cache management for bingo game"""
-    
-    # Cache key templates
-    ROUND_STATUS = 'round_status_{id}'
-    PLAYER_SELECTIONS = 'player_selections_{round_id}_{user_id}'
-    AVAILABLE_CARDS = 'available_cards_{round_id}'
-    PLAYER_COUNT = 'player_count_{round_id}'
-    RECENT_CALLS = 'recent_calls_{round_id}'
-    LIGHTWEIGHT_STATUS = 'lightweight_status_{user_id}'
-    CALLED_NUMBERS = 'called_numbers_{round_id}'
+    """Centralized cache management for bingo game
+
+    Two tiers: a small per-process LRU (LocalCache, sub-second TTL) in front
+    of the shared Redis cache. Writes and deletes are broadcast over Redis
+    pub/sub so every web worker and the engine drop their local copy.
+
+    Shared round data is keyed by round version (round_document,
+    taken_cards), a state change moves readers to new keys and old entries
+    simply expire.
     
-    @classmethod
-    def get_cached_round_status(cls, round_id):
-        """Get cached round status"""
-        key = cls.ROUND_STATUS.format(id=round_id)
-        return cache.get(key)
+    Other LocalCaches of the process (the engine's) can be attached, they
+    drop every key written or deleted here or in another process.
+    """
     
-    @classmethod
-    def set_cached_round_status(cls, round_id, data, timeout=5):
-        """Cache round status"""
-        key = cls.ROUND_STATUS.format(id=round_id)
-        cache.set(key, data, timeout)
+    local = LocalCache(
+        max_entries=getattr(settings, 'BINGO_LOCAL_CACHE_ENTRIES', 1024),
+        ttl=getattr(settings, 'BINGO_LOCAL_CACHE_TTL', 0.5)
+    )
     
-    @classmethod
-    def get_cached_selections(cls, round_id, user_id):
-        """Get cached player selections"""
-        key = cls.PLAYER_SELECTIONS.format(round_id=round_id, user_id=user_id)
-        return cache.get(key)
+    # Attached LocalCaches, dropped with their owner
+    _attached = weakref.WeakSet()
     
-    @classmethod
-    def set_cached_selections(cls, round_id, user_id, data, timeout=10):
-        """Cache player selections"""
-        key = cls.PLAYER_SELECTIONS.format(round_id=round_id, user_id=user_id)
-        cache.set(key, data, timeout)
+    # Tells this process's own broadcasts apart
+    _process_token = uuid.uuid4().hex
+    _listener_pid = None
+    _listener_lock = threading.Lock()
+    _broadcast_error_at = None
+    _broadcast_errors = 0
     
     @classmethod
-    def invalidate_selections(cls, round_id, user_id=None):
-        """Invalidate selections cache"""
-        if user_id:
-            key = cls.PLAYER_SELECTIONS.format(round_id=round_id, user_id=user_id)
-            cache.delete(key)
-        else:
-            # Delete all user caches for this round
-            from django.core.cache import cache
-            cache.delete_many([f'player_selections_{round_id}_*'])
+    def attach(cls, local_cache):
+        """Keep another LocalCache of this process coherent with the shared tier"""
+        cls._attached.add(local_cache)
+        cls._ensure_listener()
     
     @classmethod
-    def get_cached_available_cards(cls, round_id):
-        """Get cached available cards"""
-        key = cls.AVAILABLE_CARDS.format(round_id=round_id)
-        return cache.get(key)
+    def get(cls, key, default=None):
+        """Read through both tiers"""
+        cls._ensure_listener()
+        value = cls.local.get(key)
+        if value is None:
+            value = cache.get(key)
+            if value is None:
+                return default
+            cls.local.set(key, value)
+        return value
     
     @classmethod
-    def set_cached_available_cards(cls, round_id, data, timeout=10):
-        """Cache available cards"""
-        key = cls.AVAILABLE_CARDS.format(round_id=round_id)
-        cache.set(key, data, timeout)
+    def set(cls, key, value, timeout=None):
+        """Write both tiers, other processes drop their local copy"""
+        cache.set(key, value, timeout)
+        cls.local.set(key, value)
+        cls._drop_attached([key])
+        cls._broadcast([key])
     
     @classmethod
-    def get_cached_player_count(cls, round_id):
-        """Get cached player count"""
-        key = cls.PLAYER_COUNT.format(round_id=round_id)
-        return cache.get(key)
+    def delete(cls, *keys):
+        cache.delete_many(keys)
+        for key in keys:
+            cls.local.delete(key)
+        cls._drop_attached(keys)
+        cls._broadcast(keys)
     
     @classmethod
-    def set_cached_player_count(cls, round_id, count, timeout=10):
-        """Cache player count"""
-        key = cls.PLAYER_COUNT.format(round_id=round_id)
-        cache.set(key, count, timeout)
+    def get_or_compute(cls, key, compute, timeout, beta=1.0, lock_timeout=5, wait=2.0):
+        """Cached value of key, compute() it on a miss, at most one process at a time.
+
+        Single-flight: on a miss only the caller that wins the cache.add lock
+        runs compute(), the others poll for its result for up to `wait`
+        seconds (then compute on their own rather than fail).
+
+        Probabilistic early refresh (XFetch): entries remember how long they
+        took to compute, and a reader refreshes the entry before it expires
+        with a probability that grows as expiry approaches and with the
+        compute time. The refreshing reader holds the lock, everyone else keeps
+        getting the current value, so hot keys never expire under load.
+        """
+        lock_key = f'{key}_lock'
+        entry = cls.get(key)
+        
+        if entry is not None:
+            # -log(random) is exponentially distributed, mostly small, sometimes large
+            early = entry['delta'] * beta * -math.log(1.0 - random.random())
+            if time.time() + early < entry['expiry'] or not cache.add(lock_key, 1, lock_timeout):
+                return entry['value']
+            return cls._compute(key, lock_key, compute, timeout)
+        
+        if cache.add(lock_key, 1, lock_timeout):
+            return cls._compute(key, lock_key, compute, timeout)
+        
+        # Someone else is computing it, wait for their result
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+        return cls._compute(key, None, compute, timeout)
     
     @classmethod
-    def invalidate_player_count(cls, round_id):
-        """Invalidate player count cache"""
-        key = cls.PLAYER_COUNT.format(round_id=round_id)
-        cache.delete(key)
+    def set_computed(cls, key, value, timeout, delta=0.0):
+        """Store a value the way get_or_compute reads it"""
+        cls.set(key, {
+            'value': value,
+            'delta': delta,
+            'expiry': time.time() + timeout,
+        }, timeout)
     
     @classmethod
-    def get_cached_recent_calls(cls, round_id):
-        """Get cached recent calls"""
-        key = cls.RECENT_CALLS.format(round_id=round_id)
-        return cache.get(key)
+    def _compute(cls, key, lock_key, compute, timeout):
+        started = time.monotonic()
+        try:
+            value = compute()
+            if value is not None:
+                cls.set_computed(key, value, timeout, time.monotonic() - started)
+            return value
+        finally:
+            if lock_key:
+                cache.delete(lock_key)
     
     @classmethod
-    def set_cached_recent_calls(cls, round_id, data, timeout=2):
-        """Cache recent calls"""
-        key = cls.RECENT_CALLS.format(round_id=round_id)
-        cache.set(key, data, timeout)
+    def _drop_attached(cls, keys):
+        for local_cache in list(cls._attached):
+            for key in keys:
+                local_cache.delete(key)
     
     @classmethod
-    def get_cached_called_numbers(cls, round_id):
-        """Get cached called numbers"""
-        key = cls.CALLED_NUMBERS.format(round_id=round_id)
-        return cache.get(key)
+    def _broadcast(cls, keys):
+        if get_redis_connection is None:
+            return
+        try:
+            get_redis_connection('default').publish(INVALIDATION_CHANNEL, json.dumps({
+                'sender': cls._process_token,
+                'keys': list(keys),
+            }))
+        except Exception as e:
+            # Not a Redis cache or Redis is down, local entries still expire on their own
+            cls._broadcast_errors += 1
+            now = time.monotonic()
+            if cls._broadcast_error_at is None or now - cls._broadcast_error_at >= BROADCAST_ERROR_LOG_INTERVAL:
+                print(f"Error broadcasting cache invalidation ({cls._broadcast_errors} failed since last logged): {e}")
+                cls._broadcast_error_at = now
+                cls._broadcast_errors = 0
     
     @classmethod
-    def set_cached_called_numbers(cls, round_id, data, timeout=30):
-        """Cache called numbers"""
-        key = cls.CALLED_NUMBERS.format(round_id=round_id)
-        cache.set(key, data, timeout)
+    def _ensure_listener(cls):
+        """Start this process's pub/sub listener, once per process (workers fork)"""
+        if cls._listener_pid == os.getpid() or get_redis_connection is None:
+            return
+        
+        with cls._listener_lock:
+            if cls._listener_pid == os.getpid():
+                return
+            cls._listener_pid = os.getpid()
+            # Entries inherited from the parent missed its invalidations
+            cls.local.clear()
+            for local_cache in list(cls._attached):
+                local_cache.clear()
+            cls._process_token = uuid.uuid4().hex
+            
+            try:
+                client = get_redis_connection('default')
+            except Exception as e:
+                print(f"Cache invalidation listener disabled: {e}")
+                return
+            
+            threading.Thread(
+                target=cls._listen,
+                args=(client,),
+                name='bingo-cache-invalidation',
+                daemon=True
+            ).start()
     
     @classmethod
-    def invalidate_game_caches(cls, round_id):
-        """Invalidate all game caches for a round"""
-        keys = [
-            cls.ROUND_STATUS.format(id=round_id),
-            cls.AVAILABLE_CARDS.format(round_id=round_id),
-            cls.PLAYER_COUNT.format(round_id=round_id),
-            cls.RECENT_CALLS.format(round_id=round_id),
-            f"available_cards_{round_id}",
-            f"player_count_{round_id}",
-        ]
-        cache.delete_many(keys)
-        
-        # Also delete lightweight status caches
-        cache.delete_many([f'lightweight_status_*'])
\ No newline at end of file
+    def _listen(cls, client):
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    data = json.loads(message['data'])
+                    if data.get('sender') == cls._process_token:
+                        continue
+                    keys = data.get('keys', [])
+                    for key in keys:
+                        cls.local.delete(key)
+                    cls._drop_attached(keys)
+            except Exception as e:
+                # Missed messages are unknown, start over from empty local tiers
+                print(f"Cache invalidation listener error: {e}")
+                cls.local.clear()
+                for local_cache in list(cls._attached):
+                    local_cache.clear()
+                time.sleep(1)
@@ -0,0 +1,98 @@
+# bingo/call_log.py
+from datetime import timedelta
+import struct
+
+from django.utils import timezone
+
+from .events import letter_for
+
+# A round calls each of 1-75 at most once
+MAX_CALLS = 75
+
+# Big-endian milliseconds since the first call, ~49 days of range
+OFFSET_FORMAT = '>I'
+OFFSET_SIZE = struct.calcsize(OFFSET_FORMAT)
+
+
+class CallLog:
+    """Append-only log of a round's calls, stored on GameRound.
+
+    numbers holds one byte per called number in call order, offsets the
+    milliseconds between the first call (started_at) and each call. The
+    whole log of a round is at most 75 + 300 bytes, any call is read by
+    index without touching CalledNumber.
+    """
+
+    __slots__ = ('numbers', 'offsets', 'started_at')
+
+    def __init__(self, numbers=b'', offsets=b'', started_at=None):
+        # Postgres hands back memoryview for bytea
+        self.numbers = bytes(numbers or b'')
+        self.offsets = bytes(offsets or b'')
+        self.started_at = started_at
+
+    @classmethod
+    def from_round(cls, game_round):
+        return cls(game_round.call_log, game_round.call_offsets, game_round.call_log_started_at)
+
+    def append(self, number, called_at):
+        if len(self.numbers) >= MAX_CALLS:
+            raise ValueError("Call log is full")
+        if self.started_at is None:
+            self.started_at = called_at
+        offset = max(0, int((called_at - self.started_at).total_seconds() * 1000))
+        self.numbers += bytes([number])
+        self.offsets += struct.pack(OFFSET_FORMAT, offset)
+
+    def fields(self):
+        """GameRound fields holding the log, for update()"""
+        return {
+            'call_log': self.numbers,
+            'call_offsets': self.offsets,
+            'call_log_started_at': self.started_at,
+        }
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def number_at(self, index):
+        return self.numbers[index]
+
+    def called_at(self, index):
+        if index < 0:
+            index += len(self.numbers)
+        offset, = struct.unpack_from(OFFSET_FORMAT, self.offsets, index * OFFSET_SIZE)
+        return self.started_at + timedelta(milliseconds=offset)
+
+    @property
+    def last_call_at(self):
+        return self.called_at(-1) if self.numbers else None
+
+    def to_list(self):
+        """Called numbers in call order"""
+        return list(self.numbers)
+
+    def call(self, index):
+        """One call in the shape of CalledNumberSerializer, id is the 1-based call sequence"""
+        if index < 0:
+            index += len(self.numbers)
+        number = self.numbers[index]
+        return {
+            'id': index + 1,
+            'letter': letter_for(number),
+            'number': number,
+            'called_at': timezone.localtime(self.called_at(index)).isoformat(),
+        }
+
+    def recent(self, count=4):
+        """Last `count` calls, newest first"""
+        return [self.call(index) for index in range(len(self.numbers) - 1, max(len(self.numbers) - count, 0) - 1, -1)]
+
+    def since(self, moment):
+        """Calls made after `moment`, oldest first"""
+        if moment is None:
+            return [self.call(index) for index in range(len(self.numbers))]
+        return [
+            self.call(index) for index in range(len(self.numbers))
+            if self.called_at(index) > moment
+        ]
@@ -0,0 +1,163 @@
+# bingo/card_catalogue.py
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import BingoCard
+
+# Bumped by generate_bingo_cards, every process reloads when it changes
+CATALOGUE_VERSION_KEY = 'bingo_card_catalogue_version'
+
+# Seconds between two checks of the shared version
+VERSION_CHECK_INTERVAL = 2
+
+# Minimum seconds between two full reloads for a card that isn't known
+MISS_RELOAD_INTERVAL = 10
+
+
+class CatalogueCard:
+    """Immutable, normalized view of one BingoCard"""
+
+    __slots__ = ('id', 'card_number', 'is_active', 'grid', 'flat', 'positions')
+
+    def __init__(self, card_id, card_number, numbers, is_active=True):
+        # flat[position] with position = row * 5 + col, numbers is [[B], [I], [N], [G], [O]]
+        flat = []
+        for pos in range(25):
+            try:
+                flat.append(int(numbers[pos % 5][pos // 5]))
+            except (IndexError, ValueError, TypeError):
+                flat.append(0)  # Never matches a called number
+
+        object.__setattr__(self, 'id', card_id)
+        object.__setattr__(self, 'card_number', card_number)
+        object.__setattr__(self, 'is_active', is_active)
+        object.__setattr__(self, 'flat', tuple(flat))
+        # Same layout as BingoCard.numbers, with integer cells
+        object.__setattr__(self, 'grid', tuple(
+            tuple(flat[row * 5 + col] for row in range(5)) for col in range(5)
+        ))
+        # number -> position
+        object.__setattr__(self, 'positions', {
+            number: pos for pos, number in enumerate(flat) if number
+        })
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogueCard is immutable")
+
+    def __repr__(self):
+        return f"CatalogueCard(card_number={self.card_number}, id={self.id})"
+
+
+class CardCatalogue:
+    """Process-wide catalogue of every bingo card.
+
+    Loaded lazily on first use and kept until generate_bingo_cards bumps
+    the shared version key. The version is checked at most once every
+    VERSION_CHECK_INTERVAL seconds, and right away when a lookup misses.
+    """
+
+    _lock = threading.Lock()
+    _by_number = None
+    _by_id = None
+    _version = None
+    _checked_at = 0.0
+    _loaded_at = 0.0
+
+    @classmethod
+    def _current_version(cls):
+        try:
+            return cache.get(CATALOGUE_VERSION_KEY, 0)
+        except Exception:
+            return cls._version
+
+    @classmethod
+    def _load(cls, version):
+        by_number = {}
+        by_id = {}
+        rows = BingoCard.objects.order_by('card_number').values_list(
+            'id', 'card_number', 'numbers', 'is_active'
+        )
+        for card_id, card_number, numbers, is_active in rows:
+            card = CatalogueCard(card_id, card_number, numbers, is_active)
+            by_number[card_number] = card
+            by_id[card_id] = card
+
+        cls._by_number = by_number
+        cls._by_id = by_id
+        cls._version = version
+        cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def _ensure_loaded(cls):
+        now = time.monotonic()
+        if cls._by_number is not None and now - cls._checked_at < VERSION_CHECK_INTERVAL:
+            return
+
+        with cls._lock:
+            if cls._by_number is not None and now - cls._checked_at < VERSION_CHECK_INTERVAL:
+                return
+            version = cls._current_version()
+            if cls._by_number is None or version != cls._version:
+                cls._load(version)
+            cls._checked_at = now
+
+    @classmethod
+    def _reload_on_miss(cls):
+        """Reload after a lookup missed, returns True if it reloaded.
+
+        A new shared version reloads right away. With the same version the
+        card may still have been added without a bump, that reload runs at
+        most once every MISS_RELOAD_INTERVAL seconds so unknown ids can't
+        keep reading the whole cards table.
+        """
+        with cls._lock:
+            now = time.monotonic()
+            version = cls._current_version()
+            cls._checked_at = now
+            if cls._by_number is not None and version == cls._version and now - cls._loaded_at < MISS_RELOAD_INTERVAL:
+                return False
+            cls._load(version)
+            return True
+
+    @classmethod
+    def get(cls, card_number):
+        """Card by card_number, None if it doesn't exist"""
+        cls._ensure_loaded()
+        card = cls._by_number.get(card_number)
+        if card is None and cls._reload_on_miss():
+            card = cls._by_number.get(card_number)
+        return card
+
+    @classmethod
+    def get_by_id(cls, card_id):
+        """Card by BingoCard id, None if it doesn't exist"""
+        cls._ensure_loaded()
+        card = cls._by_id.get(card_id)
+        if card is None and cls._reload_on_miss():
+            card = cls._by_id.get(card_id)
+        return card
+
+    @classmethod
+    def all(cls, active_only=True):
+        """Cards in card_number order"""
+        cls._ensure_loaded()
+        return [card for card in cls._by_number.values() if card.is_active or not active_only]
+
+    @classmethod
+    def version(cls):
+        """Shared catalogue version, changes whenever the cards table does"""
+        cls._ensure_loaded()
+        return cls._version or 0
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the catalogue in every process, call after changing the cards table"""
+        try:
+            cache.incr(CATALOGUE_VERSION_KEY)
+        except ValueError:
+            cache.set(CATALOGUE_VERSION_KEY, 1, None)
+        with cls._lock:
+            cls._by_number = None
+            cls._by_id = None
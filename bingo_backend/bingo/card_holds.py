@@ -0,0 +1,50 @@
+# bingo/card_holds.py
+from django.conf import settings
+from django.core.cache import cache
+
+# How long a reserved card stays out of reach of other players
+CARD_HOLD_SECONDS = getattr(settings, 'BINGO_CARD_HOLD_SECONDS', 15)
+
+
+def card_hold_key(round_id, card_number):
+    return f'card_hold_{round_id}_{card_number}'
+
+
+def reserve_card(round_id, card_number, user_id, seconds=None):
+    """Hold a card for user_id, returns the id of the player holding it.
+
+    cache.add is atomic, of two players racing for a card only one gets it.
+    A player reserving their own card again just extends the hold.
+    """
+    seconds = seconds or CARD_HOLD_SECONDS
+    key = card_hold_key(round_id, card_number)
+    if cache.add(key, user_id, seconds):
+        return user_id
+
+    holder = cache.get(key)
+    if holder is None:
+        # Expired between the two calls
+        return user_id if cache.add(key, user_id, seconds) else cache.get(key)
+    if holder == user_id:
+        cache.touch(key, seconds)
+    return holder
+
+
+def release_card(round_id, card_number, user_id):
+    """Drop the user's hold on a card, holds of other players are left alone"""
+    key = card_hold_key(round_id, card_number)
+    if cache.get(key) == user_id:
+        cache.delete(key)
+
+
+def card_holders(round_id, card_numbers):
+    """{card_number: user_id} of the held cards among card_numbers, one cache round trip"""
+    keys = {card_hold_key(round_id, n): n for n in card_numbers}
+    held = cache.get_many(list(keys))
+    return {keys[key]: user_id for key, user_id in held.items()}
+
+
+def held_by_other(round_id, card_number, user_id):
+    """True if another player holds the card"""
+    holder = cache.get(card_hold_key(round_id, card_number))
+    return holder is not None and holder != user_id
@@ -0,0 +1,100 @@
+# bingo/card_state.py
+FREE_POSITION = 12  # Middle position (row 3, col 3) in 5x5 grid
+
+# Winning patterns (positions 0-24 in 5x5 grid)
+WINNING_PATTERNS = {
+    'full_house': set(range(25)),  # All 25 positions
+
+    # Diagonals
+    'diagonal_1': {0, 6, 12, 18, 24},  # Top-left to bottom-right
+    'diagonal_2': {4, 8, 12, 16, 20},  # Top-right to bottom-left
+
+    # Four corners
+    'four_corners': {0, 4, 20, 24},
+
+    # Rows
+    'row_1': {0, 1, 2, 3, 4},
+    'row_2': {5, 6, 7, 8, 9},
+    'row_3': {10, 11, 12, 13, 14},
+    'row_4': {15, 16, 17, 18, 19},
+    'row_5': {20, 21, 22, 23, 24},
+
+    # Columns
+    'col_1': {0, 5, 10, 15, 20},
+    'col_2': {1, 6, 11, 16, 21},
+    'col_3': {2, 7, 12, 17, 22},
+    'col_4': {3, 8, 13, 18, 23},
+    'col_5': {4, 9, 14, 19, 24},
+}
+
+
+def positions_to_mask(positions):
+    """Convert an iterable of positions 0-24 to a 25-bit mask"""
+    mask = 0
+    for pos in positions:
+        mask |= 1 << int(pos)
+    return mask
+
+
+def mask_to_positions(mask):
+    """Convert a 25-bit mask back to a sorted list of positions"""
+    return [pos for pos in range(25) if mask >> pos & 1]
+
+
+FULL_MASK = (1 << 25) - 1
+FREE_MASK = 1 << FREE_POSITION
+
+# Precomputed (name, mask, positions) for every pattern, in WINNING_PATTERNS order
+PATTERN_MASKS = [
+    (name, positions_to_mask(positions), tuple(sorted(positions)))
+    for name, positions in WINNING_PATTERNS.items()
+]
+
+
+class CardState:
+    """Marks of one card held as a 25-bit integer"""
+
+    __slots__ = ('selection_id', 'marks')
+
+    def __init__(self, selection_id=None, marks=0):
+        self.selection_id = selection_id
+        self.marks = marks
+
+    @classmethod
+    def from_positions(cls, positions, selection_id=None):
+        return cls(selection_id, positions_to_mask(positions or []))
+
+    def mark(self, position):
+        """Mark a position, returns False if it was already marked"""
+        bit = 1 << position
+        if self.marks & bit:
+            return False
+        self.marks |= bit
+        return True
+
+    @property
+    def positions(self):
+        return mask_to_positions(self.marks)
+
+    @property
+    def count(self):
+        return bin(self.marks).count('1')
+
+    def winning_patterns(self, with_free=False):
+        """Return {pattern_name: positions} for every completed pattern"""
+        marks = self.marks | FREE_MASK if with_free else self.marks
+        return {
+            name: list(positions)
+            for name, mask, positions in PATTERN_MASKS
+            if marks & mask == mask
+        }
+
+    def has_win(self, with_free=False):
+        marks = self.marks | FREE_MASK if with_free else self.marks
+        for _, mask, _ in PATTERN_MASKS:
+            if marks & mask == mask:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"CardState(selection_id={self.selection_id}, marks={self.marks:#09x})"
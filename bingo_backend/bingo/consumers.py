@@ -0,0 +1,69 @@
+# bingo/consumers.py
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.core.serializers.json import DjangoJSONEncoder
+import json
+
+from .events import LOBBY_GROUP, current_round_snapshot, round_group
+
+
+class GameConsumer(AsyncJsonWebsocketConsumer):
+    """Live game events for the current round.
+
+    Clients join the lobby group and the group of the current round. When
+    the engine opens a new round (round_state event) the consumer moves the
+    client to the new round's group, so clients never have to reconnect.
+    Anonymous connections are refused, like the polling endpoints. The user
+    comes from the session or from ?token=<JWT access token> (see
+    bingo.token_auth.JWTAuthMiddleware).
+    """
+
+    async def connect(self):
+        self.round_id = None
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(LOBBY_GROUP, self.channel_name)
+        await self.accept()
+
+        # Initial snapshot, later changes arrive as events
+        snapshot = await self.get_current_round()
+        if snapshot:
+            await self.join_round(snapshot['round_id'])
+            await self.send_json(snapshot)
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(LOBBY_GROUP, self.channel_name)
+        if self.round_id is not None:
+            await self.channel_layer.group_discard(round_group(self.round_id), self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def join_round(self, round_id):
+        if round_id == self.round_id:
+            return
+        if self.round_id is not None:
+            await self.channel_layer.group_discard(round_group(self.round_id), self.channel_name)
+        self.round_id = round_id
+        await self.channel_layer.group_add(round_group(round_id), self.channel_name)
+
+    async def game_event(self, event):
+        """Handler of EVENT_MESSAGE_TYPE messages published by bingo.events"""
+        payload = event['payload']
+
+        if payload.get('type') == 'round_state' and payload.get('status') in ('waiting', 'active'):
+            await self.join_round(payload['round_id'])
+
+        await self.send_json(payload)
+
+    @classmethod
+    async def encode_json(cls, content):
+        return json.dumps(content, cls=DjangoJSONEncoder)
+
+    @database_sync_to_async
+    def get_current_round(self):
+        return current_round_snapshot()
@@ -0,0 +1,53 @@
+# bingo/current_round.py
+from collections import namedtuple
+
+from .cache_manager import BingoCacheManager
+
+from .models import GameRound
+
+# Shared by every web worker and the engine, rewritten on every round change
+CURRENT_ROUND_KEY = 'current_round'
+CURRENT_ROUND_TTL = 5  # seconds, bounds how long a missed rewrite can go unnoticed
+
+# Latest round, the rest of it comes from the round document of its version
+CurrentRound = namedtuple('CurrentRound', ['id', 'status', 'version'])
+
+
+def build_current_round():
+    """[id, status, version] of the latest waiting, active or finished round, [] if there is none"""
+    row = GameRound.objects.filter(
+        status__in=['waiting', 'active', 'finished']
+    ).order_by('-round_number').values_list('id', 'status', 'version').first()
+    # A list, the JSON serializer turns tuples into lists anyway
+    return list(row) if row else []
+
+
+def store_current_round(game_round=None):
+    """Share the current round, call after a round change commits
+
+    The engine passes the latest round it just saved, anyone else has it re-read.
+    """
+    try:
+        if game_round is not None:
+            row = [game_round.id, game_round.status, game_round.version]
+        else:
+            row = build_current_round()
+        BingoCacheManager.set_computed(CURRENT_ROUND_KEY, row, CURRENT_ROUND_TTL)
+        return CurrentRound(*row) if row else None
+    except Exception as e:
+        print(f"Error storing current round: {e}")
+        return None
+
+
+def get_current_round():
+    """CurrentRound of the latest round, None if there is none. One query per TTL across all workers."""
+    try:
+        row = BingoCacheManager.get_or_compute(CURRENT_ROUND_KEY, build_current_round, CURRENT_ROUND_TTL)
+    except Exception as e:
+        print(f"Error reading current round: {e}")
+        row = None
+
+    # Cache down, read it for this request alone
+    if row is None:
+        row = build_current_round()
+    return CurrentRound(*row) if row else None
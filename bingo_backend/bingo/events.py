@@ -0,0 +1,80 @@
+# bingo/events.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.serializers.json import DjangoJSONEncoder
+import json
+
+from .models import GameRound
+
+# Every connected client listens here, carries round_state changes
+LOBBY_GROUP = 'bingo_lobby'
+
+# Channel layer message type, handled by GameConsumer.game_event
+EVENT_MESSAGE_TYPE = 'game.event'
+
+
+def letter_for(number):
+    """B-I-N-G-O column letter of a called number"""
+    return 'BINGO'[(int(number) - 1) // 15]
+
+
+def round_group(round_id):
+    """Group of the clients following one round"""
+    return f'bingo_round_{round_id}'
+
+
+def _send(group, event_type, data):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    # Dates and Decimals as JSON friendly values, the layer msgpacks the payload
+    payload = json.loads(json.dumps(dict(data, type=event_type), cls=DjangoJSONEncoder))
+
+    try:
+        async_to_sync(channel_layer.group_send)(group, {
+            'type': EVENT_MESSAGE_TYPE,
+            'payload': payload,
+        })
+    except Exception as e:
+        # Clients fall back to polling, never break the engine over a push
+        print(f"Error publishing {event_type} event: {e}")
+
+
+def publish_round_event(round_id, event_type, **data):
+    """Push an event to every client following the round"""
+    _send(round_group(round_id), event_type, dict(data, round_id=round_id))
+
+
+def publish_round_state(game_round, **data):
+    """Push a round status change to every connected client"""
+    _send(LOBBY_GROUP, 'round_state', dict(
+        data,
+        round_id=game_round.id,
+        round_number=game_round.round_number,
+        status=game_round.status,
+        selection_end_time=game_round.selection_end_time,
+        next_round_at=game_round.next_round_at,
+    ))
+
+
+def current_round_snapshot():
+    """round_state event of the current round with its called numbers, None if no round is open"""
+    game_round = GameRound.objects.filter(
+        status__in=['waiting', 'active']
+    ).order_by('-round_number').only(
+        'id', 'round_number', 'status', 'selection_end_time', 'next_round_at', 'call_log'
+    ).first()
+
+    if not game_round:
+        return None
+
+    return {
+        'type': 'round_state',
+        'round_id': game_round.id,
+        'round_number': game_round.round_number,
+        'status': game_round.status,
+        'selection_end_time': game_round.selection_end_time,
+        'next_round_at': game_round.next_round_at,
+        'called_numbers': game_round.called_numbers,
+    }
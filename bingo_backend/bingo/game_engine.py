@@ -6,9 +6,19 @@ import random
 from decimal import Decimal
 import time
 import gc
-from django.db import connection
+from django.db import connection, IntegrityError
+from django.db.models import F, Case, When, Value
 from django.contrib.auth.models import User
 from .models import GameRound, CalledNumber, PlayerSelection, BingoCard
+from .card_state import WINNING_PATTERNS, FREE_POSITION
+from .round_state import RoundState
+from .batch_evaluator import BatchWinnerEvaluator, is_available as batch_evaluator_available
+from .events import publish_round_event, publish_round_state
+from .round_document import store_round_document
+from .current_round import CURRENT_ROUND_KEY, store_current_round
+from .cache_manager import BingoCacheManager
+from .local_cache import LocalCache, MISSING
+from django.conf import settings
 from transactions.models import Wallet, Transaction
 
 class BingoGameEngine:
@@ -16,57 +26,46 @@ class BingoGameEngine:
     
     def __init__(self):
         self.winner_cooldown = 5  # 5 seconds cooldown after winner
+        self.selection_period = 60  # Seconds players have to pick cards
+        self.next_round_at = None  # Set while cooling down between rounds
         self.call_interval = 2
-        self.cache = {}
+        self.active_round_cache_ttl = 10  # Engine is the only writer of an active round
+        # Rounds with at least this many cards use the NumPy winner evaluator (if installed)
+        self.batch_eval_min_cards = getattr(settings, 'BINGO_BATCH_EVAL_MIN_CARDS', 100)
+        # Attached: dropped whenever a web worker rewrites the current round
+        self.cache = LocalCache(max_entries=64, ttl=2)
+        BingoCacheManager.attach(self.cache)
         self.last_gc_time = time.time()
-        self.FREE_POSITION = 12  # Middle position (row 3, col 3) in 5x5 grid
+        self.FREE_POSITION = FREE_POSITION  # Middle position (row 3, col 3) in 5x5 grid
         self.current_round_ended = False  # Track if current round has ended
         
-        # Define winning patterns (positions 0-24 in 5x5 grid)
-        self.WINNING_PATTERNS = {
-            'full_house': set(range(25)),  # All 25 positions
-            
-            # Diagonals
-            'diagonal_1': {0, 6, 12, 18, 24},  # Top-left to bottom-right
-            'diagonal_2': {4, 8, 12, 16, 20},  # Top-right to bottom-left
-            
-            # Four corners
-            'four_corners': {0, 4, 20, 24},
-            
-            # Rows
-            'row_1': {0, 1, 2, 3, 4},
-            'row_2': {5, 6, 7, 8, 9},
-            'row_3': {10, 11, 12, 13, 14},
-            'row_4': {15, 16, 17, 18, 19},
-            'row_5': {20, 21, 22, 23, 24},
-            
-            # Columns
-            'col_1': {0, 5, 10, 15, 20},
-            'col_2': {1, 6, 11, 16, 21},
-            'col_3': {2, 7, 12, 17, 22},
-            'col_4': {3, 8, 13, 18, 23},
-            'col_5': {4, 9, 14, 19, 24},
-        }
+        # Authoritative in-memory state of the running round
+        self.round_state = None
+        
+        # Winning patterns (positions 0-24 in 5x5 grid), evaluated as bitmasks
+        self.WINNING_PATTERNS = WINNING_PATTERNS
     
     def get_current_round(self):
         """Get current round with caching for minimum DB hits"""
-        cache_key = 'current_round'
+        cache_key = CURRENT_ROUND_KEY
         
-        # Check cache first (valid for 2 seconds)
-        if cache_key in self.cache:
-            cached_time, round_obj = self.cache[cache_key]
-            if time.time() - cached_time < 2:
-                return round_obj
+        # Check cache first (valid for 2 seconds, longer while the engine drives an active round)
+        round_obj = self.cache.get(cache_key, MISSING)
+        if round_obj is not MISSING:
+            return round_obj
         
         try:
             # Use only() to fetch minimum fields
             round_obj = GameRound.objects.filter(
                 status__in=['waiting', 'active']
             ).only('id', 'status', 'round_number', 'selection_end_time', 
-                  'start_time', 'called_numbers', 'total_stake').order_by('-id').first()
+                  'start_time', 'draw_sequence', 'draw_cursor', 'total_stake',
+                  'version', 'call_log', 'call_offsets',
+                  'call_log_started_at').order_by('-id').first()
             
             # Cache result
-            self.cache[cache_key] = (time.time(), round_obj)
+            ttl = self.active_round_cache_ttl if round_obj and round_obj.status == 'active' else 2
+            self.cache.set(cache_key, round_obj, ttl)
             
             # Clean cache every 60 seconds
             if time.time() - self.last_gc_time > 60:
@@ -80,14 +79,7 @@ class BingoGameEngine:
     
     def clean_cache(self):
         """Clean old cache entries"""
-        current_time = time.time()
-        keys_to_delete = []
-        for key, (cached_time, _) in self.cache.items():
-            if current_time - cached_time > 10:  # Remove entries older than 10s
-                keys_to_delete.append(key)
-        
-        for key in keys_to_delete:
-            del self.cache[key]
+        self.cache.prune()
     
     def process_tick(self):
         """Process one game tick with minimal resource usage"""
@@ -95,9 +87,25 @@ class BingoGameEngine:
             # Close idle connections to save resources
             connection.close_if_unusable_or_obsolete()
             
+            # Cooling down after a finished round
+            if self.next_round_at is not None:
+                if timezone.now() < self.next_round_at:
+                    return
+                opens_at = self.next_round_at
+                self.next_round_at = None
+                self.create_new_round(opens_at)
+                return
+            
             round_obj = self.get_current_round()
             
             if not round_obj:
+                # Restarted during a cooldown: keep the schedule of the last round
+                next_round_at = GameRound.objects.order_by('-round_number').filter(
+                    status='finished'
+                ).values_list('next_round_at', flat=True).first()
+                if next_round_at and timezone.now() < next_round_at:
+                    self.schedule_next_round(next_round_at)
+                    return
                 self.create_new_round()
                 return
             
@@ -120,17 +128,34 @@ class BingoGameEngine:
     def start_game(self, game_round):
         """Start the game round optimized"""
         try:
+            # Draw the whole call order once, persisted so it survives a restart
+            game_round.draw_sequence = random.sample(range(1, 76), 75)
+            game_round.draw_cursor = 0
+            
             # Update only necessary fields
             GameRound.objects.filter(id=game_round.id).update(
                 status='active',
-                start_time=timezone.now()
+                start_time=timezone.now(),
+                draw_sequence=game_round.draw_sequence,
+                draw_cursor=0,
+                version=F('version') + 1
             )
+            game_round.version = GameRound.objects.filter(
+                id=game_round.id
+            ).values_list('version', flat=True).first()
             
             print(f"Round {game_round.round_number} started!")
             
+            game_round.status = 'active'
+            publish_round_state(game_round)
+            store_round_document(game_round.id)
+            store_current_round(game_round)
+            
             # Invalidate cache
-            if 'current_round' in self.cache:
-                del self.cache['current_round']
+            self.cache.delete(CURRENT_ROUND_KEY)
+            
+            # Load round state (cards, marks, number index) once for the whole round
+            self.reconcile_round_state(game_round)
             
             # Mark FREE position on all player cards first
             self.mark_free_position_on_all_cards(game_round)
@@ -141,54 +166,76 @@ class BingoGameEngine:
         except Exception as e:
             print(f"Error starting game: {e}")
     
+    def get_round_state(self, game_round):
+        """Get in-memory state for the round, loading it on first use"""
+        if self.round_state is None or self.round_state.round_id != game_round.id:
+            self.reconcile_round_state(game_round)
+        return self.round_state
+    
+    def reconcile_round_state(self, game_round):
+        """Reload round state from the database (round start, engine restart or failover)"""
+        self.round_state = RoundState.load(game_round)
+        
+        # Round started without a draw sequence: shuffle what is left
+        if not self.round_state.draw_sequence:
+            remaining = list(self.round_state.remaining)
+            random.shuffle(remaining)
+            self.round_state.draw_sequence = self.round_state.called + remaining
+            self.round_state.draw_cursor = self.round_state.called_count
+            GameRound.objects.filter(id=game_round.id).update(
+                draw_sequence=self.round_state.draw_sequence,
+                draw_cursor=self.round_state.draw_cursor
+            )
+        print(f"Loaded round {game_round.round_number} state: "
+              f"{self.round_state.called_count} called, {len(self.round_state.cards)} card(s)")
+        
+        if batch_evaluator_available() and len(self.round_state.cards) >= self.batch_eval_min_cards:
+            self.round_state.batch = BatchWinnerEvaluator.from_round_state(self.round_state)
+            print(f"Using batch winner evaluator for {len(self.round_state.batch)} card(s)")
+        
+        return self.round_state
+    
+    def write_marks(self, marked):
+        """Write new marks through to the database, marked is {selection_id: position}
+        
+        One UPDATE ORs each selection's bit into marked_mask. A number sits
+        in one column of every card, so there are at most five distinct bits.
+        """
+        if not marked:
+            return
+        
+        by_position = {}
+        for selection_id, position in marked.items():
+            by_position.setdefault(position, []).append(selection_id)
+        
+        PlayerSelection.objects.filter(id__in=list(marked)).update(
+            marked_mask=F('marked_mask').bitor(Case(
+                *[When(id__in=ids, then=Value(1 << position)) for position, ids in by_position.items()],
+                default=Value(0)
+            ))
+        )
+    
     def mark_free_position_on_all_cards(self, game_round):
         """Mark FREE position (center position 12) on all player cards"""
         try:
-            # Get all active selections with their bingo cards
-            selections = PlayerSelection.objects.filter(
-                game_round=game_round,
-                is_active=True
-            ).select_related('bingo_card')
-            
-            updates = []
+            state = self.get_round_state(game_round)
+            updates = {}
             
-            for sel in selections:
-                # Get the actual FREE number from the player's card
-                card_numbers_grid = sel.bingo_card.numbers
-                
-                # The FREE position is at row=2, col=2 (0-indexed)
-                # In grid format: card_numbers_grid[col][row]
-                # For position 12: row = 12 // 5 = 2, col = 12 % 5 = 2
-                row = 2  # Third row (0-indexed)
-                col = 2  # Third column (0-indexed) - N column
-                
+            for selection_id in state.cards:
                 try:
-                    # Get the actual FREE number from the player's card
-                    free_number_list = card_numbers_grid[col]  # N column (index 2)
-                    free_number = free_number_list[row]  # Third row
-                    
-                    # Ensure free_number is integer
-                    if isinstance(free_number, str):
-                        free_number = int(free_number)
-                    
-                    print(f"  Player {sel.player.username}: FREE number is {free_number}")
-                    
-                    # Mark the FREE position if not already marked
-                    if self.FREE_POSITION not in sel.marked_positions:
-                        sel.marked_positions.append(self.FREE_POSITION)
-                        sel.marked_numbers.append(free_number)
-                        updates.append(sel)
-                        
+                    # The FREE position is at row=2, col=2 (0-indexed) - N column
+                    free_number = state.free_number(selection_id)
                 except (IndexError, ValueError, TypeError) as e:
-                    print(f"Error getting FREE number for player {sel.player.username}: {e}")
+                    print(f"Error getting FREE number for selection {selection_id}: {e}")
                     continue
+                
+                # Mark the FREE position if not already marked
+                if state.mark_position(selection_id, self.FREE_POSITION):
+                    updates[selection_id] = self.FREE_POSITION
             
             # Batch update
             if updates:
-                PlayerSelection.objects.bulk_update(
-                    updates, 
-                    ['marked_positions', 'marked_numbers']
-                )
+                self.write_marks(updates)
                 print(f"Marked FREE position on {len(updates)} player card(s)")
                         
         except Exception as e:
@@ -197,40 +244,20 @@ class BingoGameEngine:
     def call_free_numbers(self, game_round):
         """Call all the FREE numbers from player cards"""
         try:
-            # Get all unique FREE numbers from player cards
-            selections = PlayerSelection.objects.filter(
-                game_round=game_round,
-                is_active=True
-            ).select_related('bingo_card')
-            
+            state = self.get_round_state(game_round)
             free_numbers_called = set()
             
-            for sel in selections:
-                # Get the actual FREE number from the player's card
-                card_numbers_grid = sel.bingo_card.numbers
-                
-                # The FREE position is at row=2, col=2 (0-indexed)
-                row = 2  # Third row
-                col = 2  # Third column - N column
-                
+            for selection_id in list(state.cards):
                 try:
-                    # Get the actual FREE number from the player's card
-                    free_number_list = card_numbers_grid[col]  # N column (index 2)
-                    free_number = free_number_list[row]  # Third row
-                    
-                    # Ensure free_number is integer
-                    if isinstance(free_number, str):
-                        free_number = int(free_number)
-                    
-                    # Only call this FREE number if it hasn't been called yet
-                    if free_number not in free_numbers_called:
-                        # Call this FREE number
-                        self.call_specific_number(game_round, free_number, is_free=True)
-                        free_numbers_called.add(free_number)
-                        
+                    free_number = state.free_number(selection_id)
                 except (IndexError, ValueError, TypeError) as e:
-                    print(f"Error calling FREE number for player {sel.player.username}: {e}")
+                    print(f"Error calling FREE number for selection {selection_id}: {e}")
                     continue
+                
+                # Only call this FREE number if it hasn't been called yet
+                if free_number not in free_numbers_called:
+                    self.call_specific_number(game_round, free_number, is_free=True)
+                    free_numbers_called.add(free_number)
             
             # After calling all FREE numbers, check for winners immediately
             self.check_and_declare_winners_immediately(game_round)
@@ -238,9 +265,61 @@ class BingoGameEngine:
         except Exception as e:
             print(f"Error calling FREE numbers: {e}")
     
+    def record_called_number(self, game_round, number, letter):
+        """Write a called number through to the database
+        
+        One UPDATE appends the call to the round's compact call log and
+        bumps the version. CalledNumber rows are only written as an audit
+        export when BINGO_CALL_AUDIT is on.
+        """
+        state = self.get_round_state(game_round)
+        called_at = timezone.now()
+        state.call_log.append(number, called_at)
+        
+        # Each call is a new round version
+        previous_version = state.version
+        state.bump_version()
+        
+        # Only from the version this engine last wrote, another writer means a reload
+        updated = GameRound.objects.filter(id=game_round.id, version=previous_version).update(
+            draw_cursor=state.draw_cursor,
+            version=state.version,
+            **state.call_log.fields()
+        )
+        if not updated:
+            raise IntegrityError(f"Round {game_round.id} changed since version {previous_version}")
+        
+        if getattr(settings, 'BINGO_CALL_AUDIT', False):
+            CalledNumber.objects.create(
+                game_round=game_round,
+                letter=letter,
+                number=number
+            )
+        
+        game_round.draw_cursor = state.draw_cursor
+        game_round.version = state.version
+        for field, value in state.call_log.fields().items():
+            setattr(game_round, field, value)
+        state.last_call_at = called_at
+        
+        publish_round_event(
+            game_round.id, 'number_called',
+            number=number,
+            letter=letter,
+            called_count=state.called_count,
+            called_at=called_at
+        )
+        store_round_document(game_round.id)
+        store_current_round(game_round)
+        # Sharing the round dropped the engine's copy as well, this one is current
+        self.cache.set(CURRENT_ROUND_KEY, game_round, self.active_round_cache_ttl)
+        return called_at
+    
     def call_specific_number(self, game_round, number, is_free=False):
         """Call a specific number (used for FREE numbers)"""
         try:
+            state = self.get_round_state(game_round)
+            
             # Determine letter based on number range
             if number <= 15:
                 letter = 'B'
@@ -253,24 +332,16 @@ class BingoGameEngine:
             else:
                 letter = 'O'
             
-            # Create called number record
-            CalledNumber.objects.create(
-                game_round=game_round,
-                letter=letter,
-                number=number
-            )
+            if not state.record_call(number):
+                return None
             
-            # Update game round called numbers
-            current_called = game_round.called_numbers or []
-            if number not in current_called:
-                current_called.append(number)
-                game_round.called_numbers = current_called
-                game_round.save(update_fields=['called_numbers'])
+            # Create called number record
+            self.record_called_number(game_round, number, letter)
             
             if is_free:
                 print(f"FREE NUMBER CALLED: {letter}-{number}")
             else:
-                print(f"{letter}-{number} (Total: {len(current_called)}/75)")
+                print(f"{letter}-{number} (Total: {state.called_count}/75)")
             
             # Mark this number on all player cards
             self.mark_on_cards_optimized(game_round, number)
@@ -289,65 +360,78 @@ class BingoGameEngine:
                 print(f"Round already ended, not processing")
                 return
             
-            # Sync called numbers every 10 calls to prevent desync
-            called_count = len(game_round.called_numbers or [])
-            if called_count % 10 == 0:  # Sync every 10th call
-                self.sync_called_numbers(game_round)
-            
-            # Use values_list for minimum data fetch
-            last_call = CalledNumber.objects.filter(
-                game_round=game_round
-            ).order_by('-called_at').values_list('called_at', flat=True).first()
+            state = self.get_round_state(game_round)
+            deadline = self.next_call_time(state)
+            now = timezone.now()
             
-            if not last_call:
-                # Call first regular number after FREE numbers
-                self.call_number(game_round)
+            if now < deadline:
                 return
             
-            # Calculate seconds since last call
-            seconds_since = (timezone.now() - last_call).total_seconds()
+            self.call_number(game_round)
             
-            if seconds_since >= self.call_interval:
-                self.call_number(game_round)
+            # Keep a steady cadence from the deadline, not from when we woke up
+            next_call_at = deadline + timedelta(seconds=self.call_interval)
+            if next_call_at <= now:
+                next_call_at = now + timedelta(seconds=self.call_interval)
+            state.next_call_at = next_call_at
                 
         except Exception as e:
             print(f"Error processing active game: {e}")
     
+    def next_call_time(self, state):
+        """When the next number of the round is due"""
+        if state.next_call_at is None:
+            if state.last_call_at:
+                # Picked up mid-round: schedule from the last call written
+                state.next_call_at = state.last_call_at + timedelta(seconds=self.call_interval)
+            else:
+                # Call first regular number after FREE numbers right away
+                state.next_call_at = timezone.now()
+        return state.next_call_at
+    
+    def next_deadline(self):
+        """Time of the next thing the engine has to do, from in-memory state only"""
+        if self.next_round_at is not None:
+            return self.next_round_at
+        
+        round_obj = self.cache.peek(CURRENT_ROUND_KEY)
+        
+        if not round_obj:
+            return timezone.now()
+        
+        if round_obj.status == 'waiting':
+            return round_obj.selection_end_time or timezone.now()
+        
+        if round_obj.status == 'active' and not self.current_round_ended:
+            if self.round_state is not None and self.round_state.round_id == round_obj.id:
+                return self.next_call_time(self.round_state)
+        
+        return timezone.now()
+    
+    def seconds_until_next_deadline(self, max_wait=1.0):
+        """Seconds to sleep before the next tick, capped at max_wait"""
+        try:
+            remaining = (self.next_deadline() - timezone.now()).total_seconds()
+        except Exception:
+            return max_wait
+        return max(0.0, min(remaining, max_wait))
+    
     def call_number(self, game_round):
-        """Call a random number with emergency winner check and forced declaration"""
+        """Call the next number of the draw sequence and check the cards it marked"""
         try:
             if self.current_round_ended:
                 return None
             
-            try:
-                game_round.refresh_from_db()
-            except:
-                pass
-            
-            # Get all called numbers
-            already_called_db = set(CalledNumber.objects.filter(
-                game_round=game_round
-            ).values_list('number', flat=True))
+            state = self.get_round_state(game_round)
             
-            called_from_cache = set(game_round.called_numbers or [])
-            all_called = already_called_db.union(called_from_cache)
+            # Next number of the round's draw sequence
+            number = state.next_draw()
             
             # Check if all 75 numbers have been called
-            if len(all_called) >= 75:
-                self.end_game_no_winner(game_round)
-                return None
-            
-            # Generate available numbers (1-75)
-            all_numbers = set(range(1, 76))
-            available = list(all_numbers - all_called)
-            
-            if not available:
+            if number is None:
                 self.end_game_no_winner(game_round)
                 return None
             
-            # Select random number from available
-            number = random.choice(available)
-            
             # Determine letter based on number range
             if number <= 15:
                 letter = 'B'
@@ -360,208 +444,95 @@ class BingoGameEngine:
             else:
                 letter = 'O'
             
+            state.record_call(number)
+            state.draw_cursor += 1
+            
             try:
                 # Record called number
-                CalledNumber.objects.create(
-                    game_round=game_round,
-                    letter=letter,
-                    number=number
-                )
-            except Exception as db_error:
-                if 'duplicate' in str(db_error).lower() or 'unique' in str(db_error).lower():
-                    if number in available:
-                        available.remove(number)
-                    if available:
-                        number = random.choice(available)
-                        if number <= 15:
-                            letter = 'B'
-                        elif number <= 30:
-                            letter = 'I'
-                        elif number <= 45:
-                            letter = 'N'
-                        elif number <= 60:
-                            letter = 'G'
-                        else:
-                            letter = 'O'
-                        
-                        try:
-                            CalledNumber.objects.create(
-                                game_round=game_round,
-                                letter=letter,
-                                number=number
-                            )
-                        except Exception as e2:
-                            return self.call_number_fallback(game_round, available)
-                    else:
-                        return None
-                else:
-                    return None
-            
-            # Update called numbers list
-            new_called = list(all_called)
-            if number not in new_called:
-                new_called.append(number)
-            
-            game_round.called_numbers = new_called
-            game_round.save(update_fields=['called_numbers'])
+                self.record_called_number(game_round, number, letter)
+            except IntegrityError:
+                # Someone else wrote to this round (e.g. a second engine) - reconcile
+                print(f"Called numbers out of sync for round {game_round.round_number}, reloading state")
+                game_round.refresh_from_db()
+                self.reconcile_round_state(game_round)
+                return None
             
             # Mark this number on all player cards
-            self.mark_on_cards_optimized(game_round, number)
+            changed = self.mark_on_cards_optimized(game_round, number)
             
-            print(f"{letter}-{number} (Total: {len(new_called)}/75)")
+            print(f"{letter}-{number} (Total: {state.called_count}/75)")
             
-            # Check for winners after every number call
-            winner_found = self.check_and_declare_winners_immediately(game_round)
+            # Check the cards this number marked for winners
+            self.check_and_declare_winners_immediately(game_round, selection_ids=changed)
             
-            if winner_found:
-                return number
-            else:
-                # If no winner found but many numbers called, do emergency checks
-                if len(new_called) >= 40:
-                    time.sleep(1)
-                    self.emergency_winner_check()
-                
-                if len(new_called) >= 60:
-                    self.check_extreme_winner(game_round)
-                
-                return number
+            return number
             
         except Exception as e:
-            try:
-                self.emergency_winner_check()
-            except:
-                pass
-            
-            return None
-    
-    def call_number_fallback(self, game_round, available):
-        """Fallback method for calling numbers"""
-        try:
-            if not available:
-                return None
-            
-            number = random.choice(available)
-            
-            if number <= 15:
-                letter = 'B'
-            elif number <= 30:
-                letter = 'I'
-            elif number <= 45:
-                letter = 'N'
-            elif number <= 60:
-                letter = 'G'
-            else:
-                letter = 'O'
-            
-            # Simple create without transaction
-            cn = CalledNumber(
-                game_round=game_round,
-                letter=letter,
-                number=number
-            )
-            cn.save()
-            
-            return number
-        except:
+            print(f"Error calling number: {e}")
             return None
     
-    def sync_called_numbers(self, game_round):
-        """Sync called numbers between database and cache"""
-        try:
-            # Get all called numbers from database
-            db_called = list(CalledNumber.objects.filter(
-                game_round=game_round
-            ).order_by('called_at').values_list('number', flat=True))
-            
-            # Update game round cache
-            if db_called != (game_round.called_numbers or []):
-                game_round.called_numbers = db_called
-                game_round.save(update_fields=['called_numbers'])
-                print(f"Synced called numbers: {len(db_called)} numbers")
-            
-            return db_called
-        except Exception as e:
-            print(f"Error syncing called numbers: {e}")
-            return game_round.called_numbers or []
-    
-    def check_and_declare_winners_immediately(self, game_round, forced_check=False):
-        """Check for winners and declare immediately - FIXED VERSION"""
+    def check_and_declare_winners_immediately(self, game_round, forced_check=False, selection_ids=None):
+        """Check for winners and declare immediately.
+        
+        Only the given selections (the cards the latest call marked) are
+        evaluated, a card's result can't change unless its marks do. Pass
+        None to evaluate every card of the round.
+        """
         try:
             # Don't check if round already ended
             if self.current_round_ended and not forced_check:
                 print(f"Round already ended, skipping winner check")
                 return False
             
-            # Force database sync for called numbers
-            called_numbers_set = self.sync_called_numbers(game_round)
-            called_numbers_set = set(called_numbers_set)
+            state = self.get_round_state(game_round)
             
-            print(f"Checking for winners... Called numbers: {len(called_numbers_set)}")
+            # Winners of a round are declared exactly once
+            if state.winners_declared:
+                return False
             
-            # FORCE refresh of game round from database
-            game_round.refresh_from_db()
+            # State was (re)loaded from the database: every card needs one full check
+            if state.needs_full_check:
+                selection_ids = None
+                state.needs_full_check = False
             
-            # If round is already finished in DB, set flag and skip
-            if game_round.status == 'finished':
-                print(f"Round already marked as finished in DB")
-                self.current_round_ended = True
+            if selection_ids is not None and not selection_ids:
                 return False
             
-            # Fetch all active players for this round with their cards
-            active_selections = PlayerSelection.objects.filter(
-                game_round=game_round,
-                is_active=True
-            ).select_related('bingo_card', 'player')
+            if state.batch is not None:
+                # All cards in one vectorized pass
+                winner_patterns = state.batch.find_winners(selection_ids)
+            else:
+                winner_patterns = self.find_winner_patterns(state, selection_ids)
             
-            winners = []
-            winning_patterns = {}
+            if not winner_patterns:
+                print(f"No winners found")
+                return False
             
-            # Check each active player
-            for sel in active_selections:
-                # FORCE refresh of player selection from database
-                try:
-                    sel.refresh_from_db()
-                except:
-                    pass  # If it fails, continue with current object
-                
-                # Get the card numbers in 5x5 format
-                card_numbers_grid = sel.bingo_card.numbers
-                
-                # Get marked positions (ensure it's a set)
-                marked_positions_set = set(sel.marked_positions)
-                
-                # Check for winning patterns WITH FREE POSITION INCLUDED
-                patterns_found = self.check_winning_patterns_with_free(marked_positions_set, sel)
-                
-                if patterns_found:
-                    # Verify that the actual numbers in the pattern have been called
-                    valid_patterns = self.verify_patterns_with_called_numbers(
-                        patterns_found, 
-                        card_numbers_grid, 
-                        called_numbers_set,
-                        sel
-                    )
-                    
-                    if valid_patterns:
-                        # WINNER FOUND!
-                        print(f"WINNER CONFIRMED: {sel.player.username}!")
-                        winners.append(sel)
-                        winning_patterns[sel.id] = {
-                            'patterns': valid_patterns,
-                            'card_numbers': card_numbers_grid,
-                            'marked_positions': list(marked_positions_set),
-                            'player_name': sel.player.username,
-                            'card_number': sel.bingo_card.card_number
-                        }
+            # Only winners need their player and card loaded
+            winners = list(PlayerSelection.objects.filter(
+                id__in=winner_patterns.keys()
+            ).select_related('bingo_card', 'player').order_by('id'))
+            
+            winning_patterns = {}
+            for sel in winners:
+                # WINNER FOUND!
+                print(f"WINNER CONFIRMED: {sel.player.username}!")
+                winning_patterns[sel.id] = {
+                    'patterns': winner_patterns[sel.id],
+                    'card_numbers': sel.bingo_card.numbers,
+                    'marked_positions': state.cards[sel.id].positions,
+                    'player_name': sel.player.username,
+                    'card_number': sel.bingo_card.card_number
+                }
             
             if winners:
                 print(f"Total winners found: {len(winners)}")
                 
                 # Declare all winners IMMEDIATELY
+                state.winners_declared = True
                 self.declare_winners(game_round, winners, winning_patterns)
                 return True
             
-            print(f"No winners found")
             return False
             
         except Exception as e:
@@ -569,46 +540,48 @@ class BingoGameEngine:
             import traceback
             traceback.print_exc()
             
-            # If there's an error, try a forced declaration
-            if not self.current_round_ended:
+            # If there's an error, try a forced full check once
+            if not self.current_round_ended and not forced_check:
                 print(f"Attempting forced winner check...")
                 return self.check_and_declare_winners_immediately(game_round, forced_check=True)
             return False
     
-    def check_winning_patterns_with_free(self, marked_positions_set, player_selection):
-        """Check if marked positions match any winning pattern WITH FREE POSITION"""
-        patterns_found = {}
+    def find_winner_patterns(self, state, selection_ids=None):
+        """Return {selection_id: valid_patterns} for every winning card among selection_ids"""
+        winner_patterns = {}
         
-        # Always include FREE position if it's not already marked
-        if self.FREE_POSITION not in marked_positions_set:
-            print(f"Warning: FREE position (12) not marked for {player_selection.player.username}")
-            print(f"Current marked positions: {sorted(marked_positions_set)}")
+        if selection_ids is None:
+            selection_ids = state.cards.keys()
         
-        # Check each pattern
-        for pattern_name, pattern_positions in self.WINNING_PATTERNS.items():
-            # Create a copy of the pattern positions
-            pattern_check = pattern_positions.copy()
-            
-            # IMPORTANT: If this pattern includes the FREE position (12), 
-            # we should consider it as automatically marked
-            if self.FREE_POSITION in pattern_check:
-                # Add FREE position to marked positions for this check
-                effective_marked = marked_positions_set.union({self.FREE_POSITION})
-                
-                # Check if all pattern positions are in marked positions (with FREE)
-                if pattern_check.issubset(effective_marked):
-                    patterns_found[pattern_name] = list(pattern_check)
-                    print(f"Pattern {pattern_name} found for {player_selection.player.username} (with FREE position)")
-            else:
-                # Pattern doesn't include FREE position, check normally
-                if pattern_check.issubset(marked_positions_set):
-                    patterns_found[pattern_name] = list(pattern_check)
-                    print(f"Pattern {pattern_name} found for {player_selection.player.username}")
+        # Check each card from in-memory marks
+        for selection_id in selection_ids:
+            card_state = state.cards.get(selection_id)
+            if card_state is None:
+                continue
+            # Check for winning patterns WITH FREE POSITION INCLUDED
+            if not card_state.has_win(with_free=True):
+                continue
+            
+            patterns_found = card_state.winning_patterns(with_free=True)
+            
+            # Verify that the actual numbers in the pattern have been called
+            valid_patterns = self.verify_patterns_with_called_numbers(
+                patterns_found, 
+                state.flats[selection_id], 
+                state.called_set,
+                selection_id
+            )
+            
+            if valid_patterns:
+                winner_patterns[selection_id] = valid_patterns
         
-        return patterns_found
+        return winner_patterns
     
-    def verify_patterns_with_called_numbers(self, patterns, card_numbers_grid, called_numbers_set, player_selection):
-        """Verify that the numbers in winning patterns have actually been called"""
+    def verify_patterns_with_called_numbers(self, patterns, card_numbers, called_numbers_set, selection_id):
+        """Verify that the numbers in winning patterns have actually been called
+        
+        card_numbers is the card's catalogue flat list, indexed by position.
+        """
         valid_patterns = {}
         
         for pattern_name, pattern_positions in patterns.items():
@@ -617,22 +590,9 @@ class BingoGameEngine:
             pattern_numbers = []
             
             for pos in pattern_positions:
-                # Convert flat position to grid coordinates
-                row = pos // 5
-                col = pos % 5
-                
-                # Get the number at this position in the card
-                try:
-                    # card_numbers_grid is [[B], [I], [N], [G], [O]]
-                    # So col=0 is B column, col=1 is I column, etc.
-                    number_list = card_numbers_grid[col]
-                    number = number_list[row]
-                    
-                    # Handle if number is stored as string
-                    if isinstance(number, str):
-                        number = int(number)
-                except (IndexError, ValueError, TypeError) as e:
-                    print(f"Error getting number at position {pos} for {player_selection.player.username}: {e}")
+                number = card_numbers[pos]
+                if not number:
+                    print(f"Error getting number at position {pos} for selection {selection_id}")
                     all_numbers_called = False
                     break
                 
@@ -658,67 +618,35 @@ class BingoGameEngine:
                     'positions': pattern_positions,
                     'numbers': pattern_numbers
                 }
-                print(f"Valid pattern found for {player_selection.player.username}: {pattern_name}")
+                print(f"Valid pattern found for selection {selection_id}: {pattern_name}")
         
         return valid_patterns
 
     def mark_on_cards_optimized(self, game_round, number):
-        """Mark number on player cards optimized for 5x5 grid"""
+        """Mark number on player cards using the round's number index"""
         try:
             # If round has ended, don't mark cards
             if self.current_round_ended:
-                return
-            
-            # Get all active selections for this round
-            selections = PlayerSelection.objects.filter(
-                game_round=game_round,
-                is_active=True
-            ).select_related('bingo_card')
+                return []
             
-            updates = []
-            marked_count = 0
+            state = self.get_round_state(game_round)
             
-            for sel in selections:
-                # Get card numbers in grid format
-                card_numbers_grid = sel.bingo_card.numbers
-                
-                # Search for the number in the 5x5 grid
-                found_position = -1
-                
-                for col in range(5):  # 5 columns: B, I, N, G, O
-                    column_numbers = card_numbers_grid[col]
-                    for row in range(5):  # 5 rows
-                        try:
-                            card_num = column_numbers[row]
-                            if isinstance(card_num, str):
-                                card_num = int(card_num)
-                            
-                            if card_num == number:
-                                # Calculate flat position
-                                found_position = row * 5 + col
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                    if found_position != -1:
-                        break
-                
-                # If number found on card and not already marked
-                if found_position != -1 and found_position not in sel.marked_positions:
-                    sel.marked_positions.append(found_position)
-                    sel.marked_numbers.append(number)
-                    updates.append(sel)
-                    marked_count += 1
+            # Only cards holding this number are touched
+            updates = state.mark_number(number)
             
             # Batch update
             if updates:
-                PlayerSelection.objects.bulk_update(
-                    updates, 
-                    ['marked_positions', 'marked_numbers']
-                )
-                print(f"  Marked number {number} on {marked_count} card(s)")
+                self.write_marks(updates)
+                print(f"  Marked number {number} on {len(updates)} card(s)")
+                
+                # Clients pick their own selections out of the list
+                publish_round_event(game_round.id, 'card_marked', number=number, selection_ids=list(updates))
+            
+            return list(updates)
                         
         except Exception as e:
             print(f"Error marking cards: {e}")
+            return []
     
     def declare_winners(self, game_round, winners, winning_patterns):
         """Declare multiple winners with forced database updates"""
@@ -753,14 +681,16 @@ class BingoGameEngine:
                 print(f"  Total Prize Pool: {total_prize} ETB")
                 print(f"  Prize per winner: {prize_per_winner} ETB")
                 print(f"  Admin Fee: {admin_fee} ETB")
-                print(f"  Called Numbers: {len(game_round.called_numbers or [])}/75")
+                print(f"  Called Numbers: {len(game_round.called_numbers)}/75")
                 print("-" * 50)
                 
                 # Update game round status FIRST
                 game_round.status = 'finished'
                 game_round.end_time = timezone.now()
+                game_round.next_round_at = game_round.end_time + timedelta(seconds=self.winner_cooldown)
                 game_round.prize_pool = total_prize
                 game_round.admin_fee = admin_fee
+                game_round.version += 1
                 
                 # For multiple winners, store first winner and note it's a split win
                 if num_winners == 1:
@@ -807,72 +737,8 @@ class BingoGameEngine:
                 # SAVE game round FIRST
                 game_round.save()
                 
-                # Award prize to each winner
-                for winner in winners:
-                    # Get winner with select_for_update to prevent race conditions
-                    try:
-                        player_selection = PlayerSelection.objects.select_for_update().get(id=winner.id)
-                    except PlayerSelection.DoesNotExist:
-                        continue
-                    
-                    # Get or create wallet WITH LOCK
-                    wallet, created = Wallet.objects.select_for_update().get_or_create(
-                        user=winner.player,
-                        defaults={'balance': prize_per_winner}
-                    )
-                    
-                    if not created:
-                        wallet.balance += prize_per_winner
-                        wallet.save(update_fields=['balance'])
-                    
-                    # Record win transaction
-                    pattern_data = winning_patterns[winner.id]
-                    pattern_name = list(pattern_data['patterns'].keys())[0]
-                    
-                    Transaction.objects.create(
-                        user=winner.player,
-                        transaction_type='deposit',
-                        amount=prize_per_winner,
-                        description=f'Won round {game_round.round_number} - {pattern_name} (Split: {num_winners} winners)',
-                        game_round=game_round,
-                        reference="won"
-                    )
-                    
-                    # Mark player selection as won
-                    player_selection.has_won = True
-                    player_selection.save(update_fields=['has_won'])
-                    print(winner.player)
-                
-                # Record admin fee transaction
-                try:
-                    win_player=User.objects.get(username=winner.player)
-                    admin_username=win_player.agent_id if win_player.agent_id else "nebaBingo"
-                    admin_user = User.objects.get(username=admin_username)
-                    
-                    # Get or create admin wallet WITH LOCK
-                    admin_wallet, created = Wallet.objects.select_for_update().get_or_create(
-                        user=admin_user,
-                        defaults={'balance': admin_fee}
-                    )
-                    
-                    if not created:
-                        admin_wallet.balance += admin_fee
-                        admin_wallet.save(update_fields=['balance'])
-                    
-                    Transaction.objects.create(
-                        user=admin_user,
-                        transaction_type='deposit',
-                        amount=admin_fee,
-                        description=f'Admin fee round {game_round.round_number}',
-                        game_round=game_round,
-                        reference="admin_fee"
-                    )
-                    
-                    print(f"  Admin fee recorded for user: {admin_user.username}")
-                except User.DoesNotExist:
-                    print(f"Admin user 'nebaBingo' not found. Skipping admin fee.")
-                except Exception as e:
-                    print(f"Error recording admin fee: {e}")
+                # Pay winners and the admin fee in one batch
+                self.settle_prizes(game_round, winners, winning_patterns, prize_per_winner, admin_fee)
                 
                 # CRITICAL: Set round ended flag AFTER successful winner declaration
                 self.current_round_ended = True
@@ -881,17 +747,26 @@ class BingoGameEngine:
             print(f"ROUND {game_round.round_number} COMPLETED SUCCESSFULLY!")
             print("=" * 50)
             
+            publish_round_event(
+                game_round.id, 'winner_declared',
+                prize_per_winner=prize_per_winner,
+                winning_numbers=game_round.winning_numbers,
+                winners=[{
+                    'username': winner.player.username,
+                    'card_number': winner.bingo_card.card_number,
+                    'selection_id': winner.id,
+                    'pattern': list(winning_patterns[winner.id]['patterns'].keys())[0],
+                } for winner in winners]
+            )
+            publish_round_state(game_round)
+            store_round_document(game_round.id)
+            store_current_round(game_round)
+            
             # Force clear cache
             self.cache.clear()
             
-            # Wait before new round
-            print(f"\nStarting new round in {self.winner_cooldown} seconds...")
-            for i in range(self.winner_cooldown, 0, -1):
-                print(f"  {i}...")
-                time.sleep(1)
-            
-            # Create new round
-            self.create_new_round()
+            # New round opens once the cooldown is over
+            self.schedule_next_round(game_round.next_round_at)
             
         except Exception as e:
             print(f"CRITICAL ERROR declaring winners: {e}")
@@ -907,48 +782,106 @@ class BingoGameEngine:
                     game_round = GameRound.objects.get(id=game_round.id)
                     game_round.status = 'finished'
                     game_round.end_time = timezone.now()
+                    game_round.next_round_at = game_round.end_time + timedelta(seconds=self.winner_cooldown)
+                    game_round.version += 1
                     game_round.save()
+                store_current_round()
                 
                 self.current_round_ended = True
                 print(f"Emergency round closure completed.")
             except:
                 print(f"Emergency closure failed.")
             
-            # Wait and create new round
-            time.sleep(self.winner_cooldown)
-            self.create_new_round()
+            # New round opens once the cooldown is over
+            self.schedule_next_round()
     
-    def emergency_winner_check(self):
-        """Emergency winner check to force winner declaration"""
-        try:
-            round_obj = self.get_current_round()
-            if not round_obj or round_obj.status != 'active':
-                return
-            
-            print(f"EMERGENCY WINNER CHECK for Round #{round_obj.round_number}")
-            
-            # Force winner check
-            result = self.check_and_declare_winners_immediately(round_obj, forced_check=True)
-            
-            if result:
-                print(f"Emergency check: Winner found and declared!")
-            else:
-                print(f"Emergency check: No winner found")
-                
-        except Exception as e:
-            print(f"Emergency check failed: {e}")
+    def settle_prizes(self, game_round, winners, winning_patterns, prize_per_winner, admin_fee):
+        """Credit every winner and the admin fee in a fixed number of statements.
+        
+        Must run inside the winner declaration transaction. Affected wallets
+        are locked in one ordered SELECT ... FOR UPDATE (id order, so two
+        settlements can't deadlock), credited with F() updates and all
+        transactions are written with a single bulk_create.
+        """
+        num_winners = len(winners)
+        
+        # user_id -> amount, a player winning on several cards is credited once per card
+        credits = {}
+        for winner in winners:
+            credits[winner.player_id] = credits.get(winner.player_id, Decimal('0')) + prize_per_winner
+        
+        # Admin fee goes to the winner's agent, nebaBingo otherwise
+        admin_username = winners[-1].player.agent_id or "nebaBingo"
+        admin_user = User.objects.filter(username=admin_username).only('id', 'username').first()
+        if admin_user is None:
+            print(f"Admin user '{admin_username}' not found. Skipping admin fee.")
+        else:
+            credits[admin_user.id] = credits.get(admin_user.id, Decimal('0')) + admin_fee
+        
+        user_ids = sorted(credits)
+        
+        # Create missing wallets, existing ones are left untouched
+        Wallet.objects.bulk_create(
+            [Wallet(user_id=user_id, balance=Decimal('0')) for user_id in user_ids],
+            ignore_conflicts=True
+        )
+        
+        # Lock every affected wallet at once, in a stable order
+        list(Wallet.objects.select_for_update().filter(
+            user_id__in=user_ids
+        ).order_by('id').values_list('id', flat=True))
+        
+        # One UPDATE per distinct amount
+        by_amount = {}
+        for user_id, amount in credits.items():
+            by_amount.setdefault(amount, []).append(user_id)
+        now = timezone.now()
+        for amount, amount_user_ids in by_amount.items():
+            Wallet.objects.filter(user_id__in=amount_user_ids).update(
+                balance=F('balance') + amount,
+                updated_at=now
+            )
+        
+        # Prize and fee transactions
+        transactions = []
+        for winner in winners:
+            pattern_name = list(winning_patterns[winner.id]['patterns'].keys())[0]
+            transactions.append(Transaction(
+                user_id=winner.player_id,
+                transaction_type='deposit',
+                amount=prize_per_winner,
+                description=f'Won round {game_round.round_number} - {pattern_name} (Split: {num_winners} winners)',
+                game_round=game_round,
+                reference="won"
+            ))
+        if admin_user is not None:
+            transactions.append(Transaction(
+                user_id=admin_user.id,
+                transaction_type='deposit',
+                amount=admin_fee,
+                description=f'Admin fee round {game_round.round_number}',
+                game_round=game_round,
+                reference="admin_fee"
+            ))
+        Transaction.objects.bulk_create(transactions)
+        
+        PlayerSelection.objects.filter(id__in=[winner.id for winner in winners]).update(has_won=True)
+        
+        if admin_user is not None:
+            print(f"  Admin fee recorded for user: {admin_user.username}")
     
-    def check_extreme_winner(self, game_round):
-        """Check for winners when many numbers have been called"""
-        try:
-            if self.current_round_ended:
-                return
-            
-            print(f"EXTREME WINNER CHECK: Many numbers called")
-            self.check_and_declare_winners_immediately(game_round, forced_check=True)
-            
-        except Exception as e:
-            print(f"Extreme winner check failed: {e}")
+    def schedule_next_round(self, next_round_at=None):
+        """Open the next round after the cooldown without blocking the engine"""
+        if next_round_at is None:
+            next_round_at = timezone.now() + timedelta(seconds=self.winner_cooldown)
+        
+        self.next_round_at = next_round_at
+        
+        # Drop the finished round from cache
+        self.cache.delete(CURRENT_ROUND_KEY)
+        
+        print(f"\nStarting new round at {next_round_at.isoformat()} "
+              f"(in {self.winner_cooldown} seconds)...")
     
     def print_card_grid(self, bingo_card, winning_positions=None):
         """Print the bingo card grid with marked positions highlighted"""
@@ -983,10 +916,20 @@ class BingoGameEngine:
             self.current_round_ended = True
             
             # Update game round status
+            end_time = timezone.now()
+            next_round_at = end_time + timedelta(seconds=self.winner_cooldown)
             GameRound.objects.filter(id=game_round.id).update(
                 status='finished',
-                end_time=timezone.now()
+                end_time=end_time,
+                next_round_at=next_round_at,
+                version=F('version') + 1
             )
+            game_round.status = 'finished'
+            game_round.end_time = end_time
+            game_round.next_round_at = next_round_at
+            publish_round_state(game_round)
+            store_round_document(game_round.id)
+            store_current_round()
             
             print(f"\n" + "=" * 50)
             print(f"ROUND {game_round.round_number} ENDED - NO WINNER")
@@ -1025,52 +968,53 @@ class BingoGameEngine:
             except User.DoesNotExist:
                 print(f"Admin user 'nebaBingo' not found.")
             
-            # Invalidate cache
-            if 'current_round' in self.cache:
-                del self.cache['current_round']
-            
-            # Wait before new round
-            print(f"\nStarting new round in 5 seconds...")
-            for i in range(5, 0, -1):
-                print(f"  {i}...")
-                time.sleep(1)
-            
-            # Create new round immediately
-            self.create_new_round()
+            # New round opens once the cooldown is over
+            self.schedule_next_round(next_round_at)
             
         except Exception as e:
             print(f"Error ending game: {e}")
-            time.sleep(5)
-            self.create_new_round()
+            self.schedule_next_round()
     
-    def create_new_round(self):
+    def create_new_round(self, opens_at=None):
         """Create a new game round optimized"""
         try:
             # Use aggregation for max round number
             from django.db.models import Max
-            last_num = GameRound.objects.aggregate(
-                max_round=Max('round_number')
-            )['max_round'] or 0
+            last = GameRound.objects.aggregate(
+                max_round=Max('round_number'),
+                max_version=Max('version')
+            )
             
-            next_num = last_num + 1
+            next_num = (last['max_round'] or 0) + 1
             
-            # Reset round ended flag
+            # Reset round ended flag and state of the previous round
             self.current_round_ended = False
+            self.round_state = None
+            
+            # Selection window runs from the scheduled opening time, not from when we woke up
+            opens_at = opens_at or timezone.now()
             
             # Create new round with proper datetime
             new_round = GameRound.objects.create(
                 round_number=next_num,
                 status='waiting',
-                selection_end_time=timezone.now() + timedelta(seconds=60)
+                selection_end_time=opens_at + timedelta(seconds=self.selection_period),
+                # Versions keep increasing across rounds, an old ?since= never matches
+                version=(last['max_version'] or 0) + 1
             )
             
-            # Update cache
-            self.cache['current_round'] = (time.time(), new_round)
+            # Clients move to the new round's group
+            publish_round_state(new_round)
+            store_round_document(new_round.id)
+            store_current_round(new_round)
+            
+            # Update cache, after sharing the round (which drops the engine's copy)
+            self.cache.set(CURRENT_ROUND_KEY, new_round)
             
             print(f"\n" + "*" * 50)
             print(f"NEW ROUND {next_num} CREATED")
             print("*" * 50)
-            print(f"  Selection period: 60 seconds")
+            print(f"  Selection period: {self.selection_period} seconds")
             print(f"  FREE Position: Center (position 12) will be marked automatically")
             print(f"  FREE Number: Each player has their own FREE number (N column, 31-45)")
             print(f"  Waiting for players to join...")
@@ -1089,14 +1033,10 @@ class BingoGameEngine:
                 print("No active round")
                 return
             
-            called = len(round_obj.called_numbers or [])
+            called = len(round_obj.called_numbers)
             available = 75 - called
             
-            # Get active player count
-            player_count = PlayerSelection.objects.filter(
-                game_round=round_obj,
-                is_active=True
-            ).count()
+            player_count = round_obj.player_count
             
             print(f"\nRound #{round_obj.round_number}")
             print(f"  Status: {round_obj.status}")
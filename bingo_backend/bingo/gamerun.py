@@ -19,7 +19,7 @@ engine_thread = None
 
 class GameEngineRunner:
     """
-    Background game engine runner that processes ticks every second
+    Background game engine runner that ticks on the engine's call and selection deadlines
     """
     def __init__(self):
         self.running = False
@@ -98,8 +98,8 @@ class GameEngineRunner:
                     # Reset error count on successful tick
                     self.errors = 0
                     
-                    # Sleep for interval (1 second)
-                    time.sleep(self.interval)
+                    # Sleep until the next engine deadline (at most one interval)
+                    self.shutdown_flag.wait(self.engine.seconds_until_next_deadline(max_wait=self.interval))
                     
                 except Exception as e:
                     self.errors += 1
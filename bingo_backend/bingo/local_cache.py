@@ -0,0 +1,69 @@
+# bingo/local_cache.py
+from collections import OrderedDict
+import threading
+import time
+
+# Default of get() telling a cached None apart from a miss
+MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU with a per-entry time to live.
+
+    First tier in front of Redis (see BingoCacheManager) and the engine's own
+    cache of the current round. Entries are plain Python objects, nothing is
+    serialized. Least recently used entries go first once max_entries is
+    reached.
+    """
+
+    def __init__(self, max_entries=1024, ttl=0.5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Value of a live entry, default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def peek(self, key, default=None):
+        """Value of an entry even if expired, does not touch the LRU order"""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def prune(self):
+        """Drop every expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (expires_at, _) in self._entries.items() if expires_at < now]:
+                del self._entries[key]
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __len__(self):
+        return len(self._entries)
@@ -11,7 +11,7 @@ class Command(BaseCommand):
         
         if current_round and current_round.status == 'active':
             self.stdout.write(f"🔍 Checking for winners in round #{current_round.round_number}...")
-            engine.check_for_winners(current_round)
+            engine.check_and_declare_winners_immediately(current_round)
             self.stdout.write(self.style.SUCCESS("Winner check completed"))
         else:
             self.stdout.write(self.style.WARNING("No active round to check"))
\ No newline at end of file
@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from bingo.models import BingoCard
+from bingo.card_catalogue import CardCatalogue
 import random
 
 class Command(BaseCommand):
@@ -47,4 +48,7 @@ class Command(BaseCommand):
                 )
                 cards_created += 1
         
+        # Cards table changed, every process reloads its catalogue
+        CardCatalogue.invalidate()
+        
         self.stdout.write(self.style.SUCCESS(f'Successfully created {cards_created} bingo cards. Total: {existing_cards + cards_created}'))
\ No newline at end of file
@@ -6,6 +6,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bingo_backend.settings')
 django.setup()
 
 from bingo.models import GameRound, CalledNumber, PlayerSelection
+from bingo.current_round import store_current_round
 
 def reset_current_game():
     """Reset the current game to fix duplicate numbers"""
@@ -26,6 +27,7 @@ def reset_current_game():
             status='waiting',
             selection_end_time=timezone.now() + timedelta(seconds=60)
         )
+        store_current_round()
         print(f"✅ Created new round #{current_round.round_number}")
         return
     
@@ -36,24 +38,16 @@ def reset_current_game():
         deleted_count, _ = CalledNumber.objects.filter(game_round=current_round).delete()
         print(f"🗑️  Deleted {deleted_count} called numbers")
         
-        # Reset JSON field
-        current_round.called_numbers = []
+        # Reset the call log
+        current_round.call_log = b''
+        current_round.call_offsets = b''
+        current_round.call_log_started_at = None
+        current_round.draw_cursor = 0
+        current_round.version += 1
         current_round.save()
+        store_current_round()
         print("✅ Reset called numbers list")
     
-    # Also reset any finished rounds that might have issues
-    finished_rounds = GameRound.objects.filter(status='finished')
-    for round_obj in finished_rounds:
-        # Fix any inconsistencies
-        db_numbers = set(CalledNumber.objects.filter(game_round=round_obj).values_list('number', flat=True))
-        json_numbers = set(round_obj.called_numbers or [])
-        
-        if db_numbers != json_numbers:
-            print(f"Fixing round #{round_obj.round_number}...")
-            round_obj.called_numbers = list(db_numbers)
-            round_obj.save()
-            print(f"  Fixed: {len(db_numbers)} numbers in sync")
-    
     print("\n✅ Game reset complete!")
     print(f"Current round: #{current_round.round_number}")
     print(f"Status: {current_round.status}")
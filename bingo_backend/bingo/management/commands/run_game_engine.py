@@ -67,7 +67,7 @@ class Command(BaseCommand):
             '--interval',
             type=float,
             default=3.0,
-            help='Tick interval in seconds'
+            help='Maximum seconds between ticks, the engine wakes earlier for due calls'
         )
         parser.add_argument(
             '--memory-limit',
@@ -233,9 +233,9 @@ echo "Restart signal sent at $(date)" >> /tmp/bingo_engine.log
                         ))
                         engine.print_stats()
                     
-                    # Adaptive sleep
-                    sleep_time = self.interval
-                    time.sleep(sleep_time)
+                    # Sleep exactly until the next call / selection deadline (at most one interval)
+                    sleep_time = engine.seconds_until_next_deadline(max_wait=self.interval)
+                    self.shutdown_flag.wait(sleep_time)
                     
                 except KeyboardInterrupt:
                     raise
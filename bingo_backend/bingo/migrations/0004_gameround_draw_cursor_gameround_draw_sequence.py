@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-17 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0003_playerselection_has_won'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='draw_cursor',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameround',
+            name='draw_sequence',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0004_gameround_draw_cursor_gameround_draw_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='next_round_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
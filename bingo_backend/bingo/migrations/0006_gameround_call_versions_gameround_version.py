@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0005_gameround_next_round_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='call_versions',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='gameround',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
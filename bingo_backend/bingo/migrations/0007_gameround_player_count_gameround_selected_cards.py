@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    GameRound = apps.get_model('bingo', 'GameRound')
+    PlayerSelection = apps.get_model('bingo', 'PlayerSelection')
+
+    selections = PlayerSelection.objects.filter(
+        game_round=OuterRef('pk')
+    ).order_by().values('game_round')
+
+    GameRound.objects.update(
+        player_count=Coalesce(Subquery(
+            selections.annotate(count=Count('player', distinct=True)).values('count')
+        ), 0),
+        selected_cards=Coalesce(Subquery(
+            selections.annotate(count=Count('id')).values('count')
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0006_gameround_call_versions_gameround_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='player_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gameround',
+            name='selected_cards',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
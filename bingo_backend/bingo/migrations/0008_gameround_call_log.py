@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:15
+
+from django.db import migrations, models
+import struct
+
+
+def backfill_call_log(apps, schema_editor):
+    GameRound = apps.get_model('bingo', 'GameRound')
+    CalledNumber = apps.get_model('bingo', 'CalledNumber')
+
+    rounds = {}
+    for round_id, number, called_at in CalledNumber.objects.order_by(
+        'game_round_id', 'called_at'
+    ).values_list('game_round_id', 'number', 'called_at').iterator():
+        rounds.setdefault(round_id, []).append((number, called_at))
+
+    for round_id, calls in rounds.items():
+        started_at = calls[0][1]
+        GameRound.objects.filter(id=round_id).update(
+            call_log=bytes(number for number, _ in calls),
+            call_offsets=b''.join(
+                struct.pack('>I', int((called_at - started_at).total_seconds() * 1000))
+                for _, called_at in calls
+            ),
+            call_log_started_at=started_at,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0007_gameround_player_count_gameround_selected_cards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='call_log',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.AddField(
+            model_name='gameround',
+            name='call_log_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gameround',
+            name='call_offsets',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(backfill_call_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:17
+
+from django.db import migrations, models
+
+
+def backfill_marked_mask(apps, schema_editor):
+    PlayerSelection = apps.get_model('bingo', 'PlayerSelection')
+
+    by_mask = {}
+    for selection_id, positions in PlayerSelection.objects.exclude(
+        marked_positions=[]
+    ).values_list('id', 'marked_positions').iterator():
+        mask = 0
+        for position in positions or []:
+            if 0 <= int(position) < 25:
+                mask |= 1 << int(position)
+        if mask:
+            by_mask.setdefault(mask, []).append(selection_id)
+
+    for mask, ids in by_mask.items():
+        for start in range(0, len(ids), 1000):
+            PlayerSelection.objects.filter(id__in=ids[start:start + 1000]).update(marked_mask=mask)
+
+
+def restore_marked_lists(apps, schema_editor):
+    """Rebuild marked_positions and marked_numbers from the mask and the card grid"""
+    PlayerSelection = apps.get_model('bingo', 'PlayerSelection')
+
+    batch = []
+    for selection in PlayerSelection.objects.exclude(marked_mask=0).select_related('bingo_card').iterator():
+        # Position p is row p // 5, column p % 5, the grid is stored column by column
+        grid = selection.bingo_card.numbers
+        positions = [p for p in range(25) if selection.marked_mask & (1 << p)]
+        selection.marked_positions = positions
+        selection.marked_numbers = [grid[p % 5][p // 5] for p in positions]
+        batch.append(selection)
+        if len(batch) >= 1000:
+            PlayerSelection.objects.bulk_update(batch, ['marked_positions', 'marked_numbers'])
+            batch = []
+    if batch:
+        PlayerSelection.objects.bulk_update(batch, ['marked_positions', 'marked_numbers'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0008_gameround_call_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerselection',
+            name='marked_mask',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_marked_mask, restore_marked_lists),
+        migrations.RemoveField(
+            model_name='playerselection',
+            name='marked_numbers',
+        ),
+        migrations.RemoveField(
+            model_name='playerselection',
+            name='marked_positions',
+        ),
+    ]
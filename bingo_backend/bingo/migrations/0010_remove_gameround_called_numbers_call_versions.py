@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:40
+
+from django.db import migrations
+
+
+def restore_called_numbers(apps, schema_editor):
+    """Rebuild called_numbers and call_versions from the call log"""
+    GameRound = apps.get_model('bingo', 'GameRound')
+
+    batch = []
+    for game_round in GameRound.objects.exclude(call_log=b'').iterator():
+        called = list(bytes(game_round.call_log))
+        game_round.called_numbers = called
+        # One version per call, the last one is the round's version
+        first_version = game_round.version - len(called) + 1
+        game_round.call_versions = [first_version + index for index in range(len(called))]
+        batch.append(game_round)
+        if len(batch) >= 500:
+            GameRound.objects.bulk_update(batch, ['called_numbers', 'call_versions'])
+            batch = []
+    if batch:
+        GameRound.objects.bulk_update(batch, ['called_numbers', 'call_versions'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bingo', '0009_playerselection_marked_mask'),
+    ]
+
+    operations = [
+        # Nothing to move forward, the call log already holds every call (0008)
+        migrations.RunPython(migrations.RunPython.noop, restore_called_numbers),
+        migrations.RemoveField(
+            model_name='gameround',
+            name='call_versions',
+        ),
+        migrations.RemoveField(
+            model_name='gameround',
+            name='called_numbers',
+        ),
+    ]
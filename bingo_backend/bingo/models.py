@@ -3,6 +3,9 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 import json
+from .card_state import CardState, PATTERN_MASKS, positions_to_mask
+
+PATTERN_MASK_BY_NAME = {name: mask for name, mask, _ in PATTERN_MASKS}
 
 class GameRound(models.Model):
     STATUS_CHOICES = [
@@ -20,10 +23,20 @@ class GameRound(models.Model):
     winning_pattern = models.CharField(max_length=50, null=True, blank=True)
     prize_pool = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     admin_fee = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    called_numbers = models.JSONField(default=list)
+    draw_sequence = models.JSONField(default=list)  # Shuffled 1-75, drawn once at game start
+    draw_cursor = models.PositiveSmallIntegerField(default=0)  # Next index into draw_sequence
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
     selection_end_time = models.DateTimeField(null=True, blank=True)
+    next_round_at = models.DateTimeField(null=True, blank=True)  # End of the cooldown after this round
+    version = models.PositiveIntegerField(default=0)  # Bumped on every state change, never goes back
+    # Compact call log (see bingo.call_log): one byte per called number and
+    # 4 bytes of milliseconds since call_log_started_at per call
+    call_log = models.BinaryField(default=bytes)
+    call_offsets = models.BinaryField(default=bytes)
+    call_log_started_at = models.DateTimeField(null=True, blank=True)
+    player_count = models.PositiveIntegerField(default=0)  # Distinct players, kept by card selection
+    selected_cards = models.PositiveIntegerField(default=0)  # Selected cards, kept by card selection
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -35,6 +48,11 @@ class GameRound(models.Model):
     
     def __str__(self):
         return f"Round {self.round_number} - {self.status}"
+    
+    @property
+    def called_numbers(self):
+        """Called numbers in call order, read from the call log (one byte per number)"""
+        return list(bytes(self.call_log or b''))
 
 class BingoCard(models.Model):
     card_number = models.PositiveIntegerField(unique=True)
@@ -59,94 +77,43 @@ class BingoCard(models.Model):
                 flat.append(self.numbers[row][col])
         return flat
     def check_patterns_fast(self, marked_positions_set):
-        """Ultra-fast pattern checking using set operations"""
-        patterns = {}
-        
+        """Ultra-fast pattern checking using precomputed bitmasks"""
         # Quick length check first
-        marked_count = len(marked_positions_set)
-        if marked_count < 5:  # Minimum for any pattern
-            return patterns
+        if len(marked_positions_set) < 4:  # Minimum for any pattern (four corners)
+            return {}
         
-        # Full house (all 25)
-        if marked_count == 25:
-            patterns['full_house'] = list(marked_positions_set)
-        
-        # Rows
-        for row in range(5):
-            row_set = {row * 5 + col for col in range(5)}
-            if row_set.issubset(marked_positions_set):
-                patterns[f'row_{row+1}'] = list(row_set)
-        
-        # Columns (check only if we have at least 5 marks in vertical alignment)
-        for col in range(5):
-            col_set = {row * 5 + col for row in range(5)}
-            if col_set.issubset(marked_positions_set):
-                patterns[f'col_{col+1}'] = list(col_set)
-        
-        # Diagonals
-        diag1 = {i * 5 + i for i in range(5)}  # 0,6,12,18,24
-        diag2 = {i * 5 + (4 - i) for i in range(5)}  # 4,8,12,16,20
-        
-        if diag1.issubset(marked_positions_set):
-            patterns['diagonal_1'] = list(diag1)
-        if diag2.issubset(marked_positions_set):
-            patterns['diagonal_2'] = list(diag2)
-        
-        # Four corners
-        corners = {0, 4, 20, 24}
-        if corners.issubset(marked_positions_set):
-            patterns['four_corners'] = list(corners)
-        
-        return patterns
+        return CardState.from_positions(marked_positions_set).winning_patterns()
     
     def check_patterns(self, marked_positions):
         """Check if card has any winning pattern"""
-        patterns = {
-            'full_house': self.check_full_house(marked_positions),
-            'row_1': self.check_row(0, marked_positions),
-            'row_2': self.check_row(1, marked_positions),
-            'row_3': self.check_row(2, marked_positions),
-            'row_4': self.check_row(3, marked_positions),
-            'row_5': self.check_row(4, marked_positions),
-            'col_1': self.check_column(0, marked_positions),
-            'col_2': self.check_column(1, marked_positions),
-            'col_3': self.check_column(2, marked_positions),
-            'col_4': self.check_column(3, marked_positions),
-            'col_5': self.check_column(4, marked_positions),
-            'diagonal_1': self.check_diagonal(True, marked_positions),
-            'diagonal_2': self.check_diagonal(False, marked_positions),
-            'four_corners': self.check_four_corners(marked_positions),
-        }
-        return {k: v for k, v in patterns.items() if v}
+        patterns = CardState.from_positions(marked_positions).winning_patterns()
+        return {name: True for name in patterns}
     
     def check_full_house(self, marked_positions):
         return len(marked_positions) == 25
     
     def check_row(self, row_index, marked_positions):
-        positions = [row_index * 5 + col for col in range(5)]
-        return all(pos in marked_positions for pos in positions)
+        return self._check_mask(PATTERN_MASK_BY_NAME[f'row_{row_index + 1}'], marked_positions)
     
     def check_column(self, col_index, marked_positions):
-        positions = [row * 5 + col_index for row in range(5)]
-        return all(pos in marked_positions for pos in positions)
+        return self._check_mask(PATTERN_MASK_BY_NAME[f'col_{col_index + 1}'], marked_positions)
     
     def check_diagonal(self, main_diagonal, marked_positions):
-        if main_diagonal:
-            positions = [i * 5 + i for i in range(5)]  # 0,6,12,18,24
-        else:
-            positions = [i * 5 + (4 - i) for i in range(5)]  # 4,8,12,16,20
-        return all(pos in marked_positions for pos in positions)
+        name = 'diagonal_1' if main_diagonal else 'diagonal_2'
+        return self._check_mask(PATTERN_MASK_BY_NAME[name], marked_positions)
     
     def check_four_corners(self, marked_positions):
-        corners = [0, 4, 20, 24]  # Positions of four corners
-        return all(corner in marked_positions for corner in corners)
+        return self._check_mask(PATTERN_MASK_BY_NAME['four_corners'], marked_positions)
+    
+    @staticmethod
+    def _check_mask(mask, marked_positions):
+        return positions_to_mask(marked_positions) & mask == mask
 
 class PlayerSelection(models.Model):
     game_round = models.ForeignKey(GameRound, on_delete=models.CASCADE, related_name='selections')
     player = models.ForeignKey(User, on_delete=models.CASCADE, related_name='selections')
     bingo_card = models.ForeignKey(BingoCard, on_delete=models.CASCADE)
-    marked_numbers = models.JSONField(default=list)  # List of marked numbers
-    marked_positions = models.JSONField(default=list)  # Positions 0-24
+    marked_mask = models.PositiveIntegerField(default=0)  # Bit p set when position p (0-24) is marked
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     has_won = models.BooleanField(default=False)
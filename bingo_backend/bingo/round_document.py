@@ -0,0 +1,84 @@
+# bingo/round_document.py
+import time
+
+from .cache_manager import BingoCacheManager
+
+from .call_log import CallLog
+from .models import GameRound
+
+# One document per round version, shared by every player
+ROUND_DOCUMENT_TTL = 300  # seconds
+
+
+def round_document_key(round_id, version):
+    return f'round_doc_{round_id}_v{version}'
+
+
+def build_round_document(round_id):
+    """Round fields, recent calls and counts, the part of the status that is the same for every player"""
+    game_round = GameRound.objects.select_related('winner', 'winning_card').get(id=round_id)
+
+    winner = game_round.winner
+    winning_card = game_round.winning_card
+
+    return {
+        'version': game_round.version,
+        'round': {
+            'id': game_round.id,
+            'status': game_round.status,
+            'round_number': game_round.round_number,
+            'version': game_round.version,
+            'called_numbers': game_round.called_numbers,
+            'total_stake': float(game_round.total_stake),
+            'winner': winner.username if winner else None,
+            'winner_id': game_round.winner_id,
+            'winning_card': winning_card.card_number if winning_card else None,
+            'winning_pattern': game_round.winning_pattern,
+            'prize_pool': float(game_round.prize_pool) if game_round.prize_pool else 0,
+            'selection_end_time': game_round.selection_end_time.isoformat() if game_round.selection_end_time else None,
+            'start_time': game_round.start_time.isoformat() if game_round.start_time else None,
+            'end_time': game_round.end_time.isoformat() if game_round.end_time else None,
+            'next_round_at': game_round.next_round_at.isoformat() if game_round.next_round_at else None,
+        },
+        'game': {
+            'recent_calls': CallLog.from_round(game_round).recent(4),
+            'player_count': game_round.player_count,
+            'total_cards': 200,
+            'selected_cards': game_round.selected_cards,
+        },
+    }
+
+
+def store_round_document(round_id):
+    """Build the document of the round's current version and share it"""
+    try:
+        started = time.monotonic()
+        document = build_round_document(round_id)
+        BingoCacheManager.set_computed(
+            round_document_key(round_id, document['version']),
+            document,
+            ROUND_DOCUMENT_TTL,
+            time.monotonic() - started
+        )
+        return document
+    except Exception as e:
+        print(f"Error storing round document: {e}")
+        return None
+
+
+def get_round_document(game_round):
+    """Shared document of the round's version, built once by whoever asks first"""
+    try:
+        document = BingoCacheManager.get_or_compute(
+            round_document_key(game_round.id, game_round.version),
+            lambda: build_round_document(game_round.id),
+            ROUND_DOCUMENT_TTL
+        )
+    except Exception as e:
+        print(f"Error reading round document: {e}")
+        document = None
+
+    # Cache down, build it for this request alone
+    if document is None:
+        document = build_round_document(game_round.id)
+    return document
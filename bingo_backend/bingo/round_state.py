@@ -0,0 +1,135 @@
+# bingo/round_state.py
+from .call_log import CallLog
+from .card_catalogue import CardCatalogue
+from .card_state import CardState, FREE_POSITION
+from .models import PlayerSelection
+
+
+class RoundState:
+    """Authoritative in-memory state of the round the engine is running.
+
+    Loaded once when the round starts (or when the engine picks up a round
+    after a restart), then kept in step with every call. The engine writes
+    each change through to the database, it never reads it back.
+    """
+
+    def __init__(self, round_id, round_number):
+        self.round_id = round_id
+        self.round_number = round_number
+        self.called = []  # Called numbers in call order
+        self.called_set = set()
+        self.remaining = set(range(1, 76))
+        self.call_log = CallLog()  # Called numbers with their call times
+        self.last_call_at = None
+        self.next_call_at = None  # Deadline of the next call, kept in memory
+
+        # Shuffled 1-75 drawn once per round, cursor advances one per call
+        self.draw_sequence = []
+        self.draw_cursor = 0
+
+        # Round version, moves by one with every call while the round is active
+        self.version = 0
+
+        # Per selection state
+        self.cards = {}  # selection_id -> CardState
+        self.grids = {}  # selection_id -> card numbers grid
+        self.flats = {}  # selection_id -> card numbers by position
+
+        # number -> [(selection_id, position), ...]
+        self.number_index = {}
+
+        # Optional vectorized evaluator kept in step with the marks
+        self.batch = None
+
+        # Winner detection
+        self.needs_full_check = True  # Evaluate every card once after loading
+        self.winners_declared = False
+
+    @classmethod
+    def load(cls, game_round):
+        """Load round state from the database"""
+        state = cls(game_round.id, game_round.round_number)
+
+        state.call_log = CallLog.from_round(game_round)
+        state.last_call_at = state.call_log.last_call_at
+        for number in state.call_log.to_list():
+            state.record_call(number)
+
+        state.draw_sequence = list(game_round.draw_sequence or [])
+        state.draw_cursor = game_round.draw_cursor or 0
+        state.version = game_round.version or 0
+
+        rows = PlayerSelection.objects.filter(
+            game_round_id=game_round.id,
+            is_active=True
+        ).values_list('id', 'bingo_card_id', 'marked_mask')
+
+        for selection_id, card_id, marked_mask in rows:
+            card = CardCatalogue.get_by_id(card_id)
+            if card is None:
+                continue
+            state.add_selection(selection_id, card, marked_mask)
+
+        return state
+
+    def add_selection(self, selection_id, card, marked_mask=0):
+        """Register a selection and index its card numbers from the card catalogue"""
+        self.grids[selection_id] = card.grid
+        self.flats[selection_id] = card.flat
+        self.cards[selection_id] = CardState(selection_id, marked_mask or 0)
+
+        # Flat position used by marked_positions
+        for card_num, position in card.positions.items():
+            self.number_index.setdefault(card_num, []).append((selection_id, position))
+
+    def record_call(self, number):
+        """Record a called number, returns False if it was already called"""
+        if number in self.called_set:
+            return False
+        self.called.append(number)
+        self.called_set.add(number)
+        self.remaining.discard(number)
+        return True
+
+    def bump_version(self):
+        """Version of the next round state change"""
+        self.version += 1
+        return self.version
+
+    def next_draw(self):
+        """Next number of the draw sequence, or None when every number is out"""
+        # FREE numbers are called out of sequence, skip them when reached
+        while self.draw_cursor < len(self.draw_sequence):
+            number = self.draw_sequence[self.draw_cursor]
+            if number not in self.called_set:
+                return number
+            self.draw_cursor += 1
+        return None
+
+    def mark_position(self, selection_id, position):
+        """Mark one position on one card, returns False if already marked"""
+        card = self.cards.get(selection_id)
+        if card is None or not card.mark(position):
+            return False
+        if self.batch is not None:
+            self.batch.mark_position(selection_id, position)
+        return True
+
+    def mark_number(self, number):
+        """Mark number on every card holding it, returns {selection_id: position} of the cards that changed"""
+        changed = {}
+        for selection_id, position in self.number_index.get(number, ()):
+            if self.mark_position(selection_id, position):
+                changed[selection_id] = position
+        return changed
+
+    def free_number(self, selection_id):
+        """The number sitting on the FREE (center) position of a card"""
+        number = self.flats[selection_id][FREE_POSITION]
+        if not number:
+            raise ValueError(f"No FREE number on the card of selection {selection_id}")
+        return number
+
+    @property
+    def called_count(self):
+        return len(self.called)
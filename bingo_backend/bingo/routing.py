@@ -0,0 +1,10 @@
+# bingo/routing.py
+from django.urls import path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/game/', consumers.GameConsumer.as_asgi()),
+    # WebSocketService.js connects to ws/game/<room code>/, there is one game for every room
+    path('ws/game/<str:room_code>/', consumers.GameConsumer.as_asgi()),
+]
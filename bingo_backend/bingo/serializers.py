@@ -1,6 +1,8 @@
 # bingo/serializers.py
 from rest_framework import serializers
 from .models import GameRound, BingoCard, PlayerSelection, CalledNumber
+from .card_catalogue import CardCatalogue
+from .card_state import mask_to_positions
 from transactions.models import Wallet, Transaction
 
 class BingoCardSerializer(serializers.ModelSerializer):
@@ -12,6 +14,9 @@ class BingoCardSerializer(serializers.ModelSerializer):
         fields = ['id', 'card_number', 'is_available', 'selected_by']
     
     def get_is_available(self, obj):
+        card_owners = self.context.get('card_owners')
+        if card_owners is not None:
+            return obj.id not in card_owners
         game_round = self.context.get('game_round')
         if game_round:
             return not PlayerSelection.objects.filter(
@@ -21,12 +26,15 @@ class BingoCardSerializer(serializers.ModelSerializer):
         return True
     
     def get_selected_by(self, obj):
+        card_owners = self.context.get('card_owners')
+        if card_owners is not None:
+            return card_owners.get(obj.id)
         game_round = self.context.get('game_round')
         if game_round:
             selection = PlayerSelection.objects.filter(
                 game_round=game_round,
                 bingo_card=obj
-            ).first()
+            ).select_related('player').first()
             if selection:
                 return selection.player.username
         return None
@@ -49,14 +57,26 @@ class GameRoundSerializer(serializers.ModelSerializer):
         return 0
     
     def get_player_count(self, obj):
-        return obj.selections.values('player').distinct().count()
+        return obj.player_count
 
 class PlayerSelectionSerializer(serializers.ModelSerializer):
     card_number = serializers.IntegerField(source='bingo_card.card_number', read_only=True)
+    marked_numbers = serializers.SerializerMethodField()
+    marked_positions = serializers.SerializerMethodField()
     
     class Meta:
         model = PlayerSelection
-        fields = ['id', 'card_number', 'marked_numbers', 'marked_positions']
+        fields = ['id', 'card_number', 'marked_mask', 'marked_numbers', 'marked_positions']
+    
+    # Lists derived from marked_mask, kept for clients that don't decode the mask
+    def get_marked_positions(self, obj):
+        return mask_to_positions(obj.marked_mask)
+    
+    def get_marked_numbers(self, obj):
+        card = CardCatalogue.get_by_id(obj.bingo_card_id)
+        if card is None:
+            return []
+        return [card.flat[position] for position in mask_to_positions(obj.marked_mask)]
 
 class CalledNumberSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,96 @@
+# bingo/taken_cards.py
+import base64
+
+from .cache_manager import BingoCacheManager
+
+from .models import GameRound, PlayerSelection
+
+# One bitmap per round version, rewritten on every select / deselect
+TAKEN_CARDS_TTL = 300  # seconds
+
+
+def taken_cards_key(round_id, version):
+    return f'taken_cards_{round_id}_v{version}'
+
+
+def encode_bitmap(card_numbers):
+    """Base64 bitmap with bit (card_number - 1) set for every card, LSB first in each byte"""
+    card_numbers = [n for n in card_numbers if n and n > 0]
+    bitmap = bytearray((max(card_numbers, default=0) + 7) // 8)
+    for card_number in card_numbers:
+        bitmap[(card_number - 1) // 8] |= 1 << ((card_number - 1) % 8)
+    return base64.b64encode(bytes(bitmap)).decode('ascii')
+
+
+def build_taken_bitmap(round_id):
+    """{'version', 'taken', 'count'} of the round's taken cards"""
+    version = GameRound.objects.filter(id=round_id).values_list('version', flat=True).first()
+    card_numbers = list(PlayerSelection.objects.filter(
+        game_round_id=round_id,
+        is_active=True
+    ).values_list('bingo_card__card_number', flat=True))
+
+    return {
+        'version': version or 0,
+        'taken': encode_bitmap(card_numbers),
+        'count': len(card_numbers),
+    }
+
+
+def store_taken_bitmap(round_id):
+    """Rebuild the round's bitmap at its current version, call after a select / deselect commits"""
+    try:
+        bitmap = build_taken_bitmap(round_id)
+        BingoCacheManager.set_computed(taken_cards_key(round_id, bitmap['version']), bitmap, TAKEN_CARDS_TTL)
+        return bitmap
+    except Exception as e:
+        print(f"Error storing taken cards bitmap: {e}")
+        return None
+
+
+def get_taken_bitmap(game_round):
+    """Bitmap of the round's version, built once by whoever asks first"""
+    try:
+        bitmap = BingoCacheManager.get_or_compute(
+            taken_cards_key(game_round.id, game_round.version),
+            lambda: build_taken_bitmap(game_round.id),
+            TAKEN_CARDS_TTL
+        )
+    except Exception as e:
+        print(f"Error reading taken cards bitmap: {e}")
+        bitmap = None
+
+    # Cache down, build it for this request alone
+    if bitmap is None:
+        bitmap = build_taken_bitmap(game_round.id)
+    return bitmap
+
+
+def card_owners_key(round_id, version):
+    return f'card_owners_{round_id}_v{version}'
+
+
+def build_card_owners(round_id):
+    """[(bingo_card_id, username), ...] of the round's taken cards"""
+    # Pairs rather than a dict, JSON would turn integer keys into strings
+    return list(PlayerSelection.objects.filter(
+        game_round_id=round_id
+    ).values_list('bingo_card_id', 'player__username'))
+
+
+def get_card_owners(game_round):
+    """{bingo_card_id: username} of the round's taken cards, one query per round version"""
+    try:
+        pairs = BingoCacheManager.get_or_compute(
+            card_owners_key(game_round.id, game_round.version),
+            lambda: build_card_owners(game_round.id),
+            TAKEN_CARDS_TTL
+        )
+    except Exception as e:
+        print(f"Error reading card owners: {e}")
+        pairs = None
+
+    # Cache down, build them for this request alone
+    if pairs is None:
+        pairs = build_card_owners(game_round.id)
+    return {card_id: username for card_id, username in pairs}
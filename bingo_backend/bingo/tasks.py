@@ -2,8 +2,6 @@
 from django.utils import timezone
 from django.core.management.base import BaseCommand
 from .game_engine import BingoGameEngine
-from .models import GameRound, CalledNumber
-import time
 
 def process_game_round():
     """Process current game round"""
@@ -11,33 +9,32 @@ def process_game_round():
     engine.process_game_round()
     return "Game round processed"
 
+# Engine kept for the life of the worker so call deadlines stay in memory
+_engine = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = BingoGameEngine()
+    return _engine
+
 def call_next_number_if_needed():
     """Check if we need to call next number"""
-    active_round = GameRound.objects.filter(status='active').first()
+    engine = get_engine()
+    active_round = engine.get_current_round()
     
-    if not active_round:
+    if not active_round or active_round.status != 'active':
         return "No active round"
     
-    # Check when last number was called
-    last_call = CalledNumber.objects.filter(
-        game_round=active_round
-    ).order_by('-called_at').first()
-    
-    if not last_call:
-        # No numbers called yet, call first number
-        engine = BingoGameEngine()
-        engine.call_number(active_round)
-        return "First number called"
-    
-    # Check if 2 seconds have passed since last call
-    time_since_last_call = (timezone.now() - last_call.called_at).total_seconds()
+    # Deadline comes from the engine's in-memory round state, no DB lookup
+    state = engine.get_round_state(active_round)
+    wait = (engine.next_call_time(state) - timezone.now()).total_seconds()
     
-    if time_since_last_call >= 2:
-        engine = BingoGameEngine()
-        engine.call_number(active_round)
-        return "New number called"
+    if wait > 0:
+        return f"Waiting... {wait:.1f}s remaining"
     
-    return f"Waiting... {2 - time_since_last_call:.1f}s remaining"
+    engine.process_active_game(active_round)
+    return "New number called"
 
 # Management command to run as cron job
 class Command(BaseCommand):
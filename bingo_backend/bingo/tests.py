@@ -1,3 +1,523 @@
-from django.test import TestCase
+from contextlib import redirect_stdout
+from datetime import timedelta
+from decimal import Decimal
+import base64
+import io
+import random
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from transactions.models import Transaction, Wallet
+
+from .batch_evaluator import BatchWinnerEvaluator, is_available as batch_evaluator_available
+from .call_log import CallLog
+from .card_catalogue import CardCatalogue, CatalogueCard
+from .card_state import CardState, FREE_POSITION, WINNING_PATTERNS
+from .game_engine import BingoGameEngine
+from .cache_manager import BingoCacheManager
+from .current_round import CurrentRound, get_current_round, store_current_round
+from .local_cache import LocalCache, MISSING
+from .models import BingoCard, GameRound, PlayerSelection
+from .round_document import get_round_document
+from .round_state import RoundState
+from .taken_cards import encode_bitmap, get_card_owners, get_taken_bitmap
+from .routing import websocket_urlpatterns
+from .token_auth import JWTAuthMiddlewareStack
+
+# Tests run without Redis: local memory cache, in-memory channel layer
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+TEST_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class GameEventsStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('sse_player', password='secret')
+        cls.round = GameRound.objects.create(
+            round_number=1,
+            status='waiting',
+            selection_end_time=timezone.now() + timedelta(seconds=60)
+        )
+
+    async def read_stream(self, response, frames):
+        """First `frames` SSE frames of a streaming response, then closes it"""
+        chunks = []
+        stream = aiter(response.streaming_content)
+        try:
+            while len(chunks) < frames:
+                chunk = await anext(stream)
+                chunks.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+        finally:
+            await stream.aclose()
+        return chunks
+
+    async def test_streams_round_snapshot_to_session_user(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/events/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        retry, snapshot = await self.read_stream(response, 2)
+        self.assertTrue(retry.startswith('retry: '))
+        self.assertIn(f'id: {self.round.id}:0\n', snapshot)
+        self.assertIn('event: round_state\n', snapshot)
+
+    async def test_streams_to_query_string_token(self):
+        token = str(AccessToken.for_user(self.user))
+        response = await self.async_client.get('/api/events/', {'token': token})
+
+        self.assertEqual(response.status_code, 200)
+        _, snapshot = await self.read_stream(response, 2)
+        self.assertIn('event: round_state\n', snapshot)
+
+    async def test_rejects_anonymous_and_invalid_token(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get('/api/events/', {'token': 'not-a-token'})
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class GameConsumerAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ws_player', password='secret')
+        cls.round = GameRound.objects.create(
+            round_number=1,
+            status='waiting',
+            selection_end_time=timezone.now() + timedelta(seconds=60)
+        )
+
+    async def connect(self, path):
+        # Same stack as bingo_backend.asgi, without the origin check
+        communicator = WebsocketCommunicator(JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns)), path)
+        connected, _ = await communicator.connect()
+        return communicator, connected
+
+    async def test_accepts_query_string_token(self):
+        token = str(AccessToken.for_user(self.user))
+        for path in (f'/ws/game/?token={token}', f'/ws/game/main/?token={token}'):
+            communicator, connected = await self.connect(path)
+            self.assertTrue(connected, path)
+            snapshot = await communicator.receive_json_from()
+            self.assertEqual(snapshot['type'], 'round_state')
+            self.assertEqual(snapshot['round_id'], self.round.id)
+            await communicator.disconnect()
+
+    async def test_refuses_anonymous_and_invalid_token(self):
+        for path in ('/ws/game/', '/ws/game/?token=not-a-token'):
+            communicator, connected = await self.connect(path)
+            self.assertFalse(connected, path)
+
+
+def random_card(card_id):
+    """Catalogue card with five distinct numbers per column, [[B], [I], [N], [G], [O]]"""
+    numbers = [random.sample(range(column * 15 + 1, column * 15 + 16), 5) for column in range(5)]
+    return CatalogueCard(card_id, card_id, numbers)
+
+
+@skipUnless(batch_evaluator_available(), "NumPy is not installed")
+class BatchWinnerEvaluatorTests(SimpleTestCase):
+    def test_matches_find_winner_patterns_after_every_call(self):
+        random.seed(4)
+        engine = BingoGameEngine()
+        state = RoundState(round_id=1, round_number=1)
+        for card_id in range(1, 201):
+            state.add_selection(card_id, random_card(card_id))
+        state.batch = BatchWinnerEvaluator.from_round_state(state)
+
+        found_winners = False
+        for number in random.sample(range(1, 76), 40):
+            state.record_call(number)
+            changed = state.mark_number(number)
+            with redirect_stdout(io.StringIO()):
+                for selection_ids in (None, list(changed)):
+                    self.assertEqual(
+                        state.batch.find_winners(selection_ids),
+                        engine.find_winner_patterns(state, selection_ids)
+                    )
+                found_winners = found_winners or bool(state.batch.find_winners())
+        self.assertTrue(found_winners)
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class CacheFailureTests(TestCase):
+    """Shared per-version reads are built directly when the cache fails"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='secret')
+        cls.round = GameRound.objects.create(round_number=1, status='waiting')
+        cls.cards = [
+            BingoCard.objects.create(card_number=n, numbers=random_card(n).grid)
+            for n in (1, 2)
+        ]
+        PlayerSelection.objects.create(game_round=cls.round, player=cls.user, bingo_card=cls.cards[0])
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            BingoCacheManager, 'get_or_compute', side_effect=ConnectionError("Redis is down")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_reads_fall_back_to_the_database(self):
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(get_card_owners(self.round), {self.cards[0].id: 'owner'})
+            self.assertEqual(get_taken_bitmap(self.round)['count'], 1)
+            self.assertEqual(get_round_document(self.round)['round']['id'], self.round.id)
+
+    def test_card_list_survives_cache_failure(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with redirect_stdout(io.StringIO()):
+            response = client.get('/api/cards/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(card['card_number'], card['is_available'], card['selected_by']) for card in response.data],
+            [(1, False, 'owner'), (2, True, None)]
+        )
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class CurrentRoundCacheTests(TestCase):
+    """The current round pointer is shared through the two-tier cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('poller', password='secret')
+        Wallet.objects.create(user=cls.user, balance=100)
+        cls.round = GameRound.objects.create(
+            round_number=1,
+            status='waiting',
+            selection_end_time=timezone.now() + timedelta(seconds=60)
+        )
+
+    def setUp(self):
+        cache.clear()
+        BingoCacheManager.local.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_lookup_is_cached_until_the_round_changes(self):
+        expected = CurrentRound(self.round.id, 'waiting', self.round.version)
+        self.assertEqual(get_current_round(), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_round(), expected)
+
+        GameRound.objects.filter(id=self.round.id).update(status='active', version=self.round.version + 1)
+        self.assertEqual(get_current_round(), expected)
+        store_current_round()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_round(), CurrentRound(self.round.id, 'active', self.round.version + 1))
+
+    def test_unchanged_round_answers_304_without_round_query(self):
+        version = self.client.get('/api/lightweight-status/').data['round']['version']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/lightweight-status/', {'since': version})
+        self.assertEqual(response.status_code, 304)
+        # Only the ATOMIC_REQUESTS savepoint is left
+        self.assertEqual([q['sql'] for q in queries if 'SAVEPOINT' not in q['sql']], [])
+
+    def test_status_and_taken_cards_follow_the_shared_round(self):
+        response = self.client.get('/api/status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['round']['id'], self.round.id)
+        self.assertGreater(response.data['round']['time_remaining'], 0)
+
+        response = self.client.get('/api/taken-cards/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['round_id'], response.data['count']), (self.round.id, 0))
+
+        GameRound.objects.filter(id=self.round.id).update(status='finished')
+        store_current_round()
+        self.assertEqual(self.client.get('/api/status/').status_code, 404)
+        self.assertIsNone(self.client.get('/api/taken-cards/').data['round_id'])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CacheInvalidationTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        BingoCacheManager.local.clear()
+
+    def test_attached_cache_drops_written_keys(self):
+        engine_cache = LocalCache(ttl=60)
+        BingoCacheManager.attach(engine_cache)
+        engine_cache.set('current_round', 'stale')
+        engine_cache.set('other', 'kept')
+
+        BingoCacheManager.set_computed('current_round', [1, 'active', 3], 5)
+
+        self.assertIs(engine_cache.get('current_round', MISSING), MISSING)
+        self.assertEqual(engine_cache.get('other'), 'kept')
+
+    def test_broadcast_failures_are_logged_once_per_interval(self):
+        failing = mock.Mock(side_effect=ConnectionError("Redis is down"))
+        output = io.StringIO()
+        with mock.patch('bingo.cache_manager.get_redis_connection', failing), \
+                mock.patch.object(BingoCacheManager, '_broadcast_error_at', None), \
+                mock.patch.object(BingoCacheManager, '_broadcast_errors', 0), \
+                redirect_stdout(output):
+            for _ in range(5):
+                BingoCacheManager._broadcast(['key'])
+
+        self.assertEqual(failing.call_count, 5)
+        self.assertEqual(output.getvalue().count('Error broadcasting cache invalidation'), 1)
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class SettlePrizesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = GameRound.objects.create(round_number=7, status='finished')
+        cls.cards = [
+            BingoCard.objects.create(card_number=n, numbers=random_card(n).grid)
+            for n in (1, 2, 3)
+        ]
+        cls.alice = User.objects.create_user('alice', password='secret')
+        cls.bob = User.objects.create_user('bob', password='secret')
+        Wallet.objects.create(user=cls.alice, balance=Decimal('5'))
+
+    def setUp(self):
+        self.engine = BingoGameEngine()
+        self.output = io.StringIO()
+
+    def winners(self, *players_and_cards):
+        return [
+            PlayerSelection.objects.select_related('player').get(
+                id=PlayerSelection.objects.create(
+                    game_round=self.round, player=player, bingo_card=self.cards[card]
+                ).id
+            )
+            for player, card in players_and_cards
+        ]
+
+    def settle(self, winners, prize, fee):
+        patterns = {winner.id: {'patterns': {'row_1': {'numbers': []}}} for winner in winners}
+        with redirect_stdout(self.output):
+            self.engine.settle_prizes(self.round, winners, patterns, Decimal(prize), Decimal(fee))
+
+    def balance(self, user):
+        return Wallet.objects.get(user=user).balance
+
+    def test_split_pot_pays_each_winner_and_the_fee(self):
+        admin = User.objects.create_user('nebaBingo', password='secret')
+        winners = self.winners((self.alice, 0), (self.bob, 1))
+
+        self.settle(winners, '12.00', '6.00')
+
+        self.assertEqual(self.balance(self.alice), Decimal('17.00'))
+        # Wallets are created for winners without one
+        self.assertEqual(self.balance(self.bob), Decimal('12.00'))
+        self.assertEqual(self.balance(admin), Decimal('6.00'))
+        self.assertEqual(
+            sorted(Transaction.objects.filter(game_round=self.round).values_list('user__username', 'amount', 'reference')),
+            [('alice', Decimal('12.00'), 'won'), ('bob', Decimal('12.00'), 'won'), ('nebaBingo', Decimal('6.00'), 'admin_fee')]
+        )
+        self.assertTrue(all(winner.has_won for winner in PlayerSelection.objects.filter(game_round=self.round)))
+
+    def test_fee_goes_to_the_winners_agent(self):
+        agent = User.objects.create_user('agent_smith', password='secret')
+        User.objects.create_user('nebaBingo', password='secret')
+        User.objects.filter(id=self.bob.id).update(agent_id='agent_smith')
+
+        self.settle(self.winners((self.bob, 0)), '24.00', '6.00')
+
+        self.assertEqual(self.balance(agent), Decimal('6.00'))
+        self.assertFalse(Wallet.objects.filter(user__username='nebaBingo').exists())
+
+    def test_player_winning_on_several_cards_is_paid_per_card(self):
+        User.objects.create_user('nebaBingo', password='secret')
+        winners = self.winners((self.alice, 0), (self.alice, 2), (self.bob, 1))
+
+        self.settle(winners, '8.00', '6.00')
+
+        self.assertEqual(self.balance(self.alice), Decimal('21.00'))
+        self.assertEqual(self.balance(self.bob), Decimal('8.00'))
+        self.assertEqual(Transaction.objects.filter(user=self.alice, reference='won').count(), 2)
+
+    def test_missing_admin_skips_the_fee(self):
+        self.settle(self.winners((self.alice, 0)), '24.00', '6.00')
+
+        self.assertEqual(self.balance(self.alice), Decimal('29.00'))
+        self.assertEqual(
+            list(Transaction.objects.filter(game_round=self.round).values_list('reference', flat=True)),
+            ['won']
+        )
+        self.assertIn("Admin user 'nebaBingo' not found", self.output.getvalue())
+
+
+@override_settings(CACHES=TEST_CACHES, CHANNEL_LAYERS=TEST_CHANNEL_LAYERS)
+class CardSelectionDebitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.round = GameRound.objects.create(
+            round_number=1,
+            status='waiting',
+            selection_end_time=timezone.now() + timedelta(seconds=60)
+        )
+        for n in range(1, 5):
+            BingoCard.objects.create(card_number=n, numbers=random_card(n).grid)
+        cls.player = User.objects.create_user('buyer', password='secret')
+        cls.other = User.objects.create_user('other', password='secret')
+
+    def setUp(self):
+        cache.clear()
+        BingoCacheManager.local.clear()
+        # Card ids of earlier tests may still be loaded
+        for attribute in ('_by_number', '_by_id'):
+            patcher = mock.patch.object(CardCatalogue, attribute, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.player)
+
+    def post(self, action, data):
+        with redirect_stdout(io.StringIO()):
+            return self.client.post(f'/api/rounds/{self.round.id}/{action}/', data, format='json')
+
+    def test_insufficient_balance_debits_nothing(self):
+        Wallet.objects.create(user=self.player, balance=Decimal('5'))
+
+        response = self.post('select_card', {'card_number': 1})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Insufficient balance')
+        self.assertEqual(Wallet.objects.get(user=self.player).balance, Decimal('5'))
+        self.assertFalse(PlayerSelection.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(GameRound.objects.get(id=self.round.id).total_stake, 0)
+
+    def test_selection_debits_the_bet(self):
+        Wallet.objects.create(user=self.player, balance=Decimal('15'))
+
+        response = self.post('select_card', {'card_number': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['wallet_balance'], 5.0)
+        self.assertEqual(Transaction.objects.get(user=self.player).amount, Decimal('10'))
+
+    def test_partial_batch_debits_only_the_bought_cards(self):
+        Wallet.objects.create(user=self.player, balance=Decimal('25'))
+        PlayerSelection.objects.create(
+            game_round=self.round, player=self.other, bingo_card=BingoCard.objects.get(card_number=1)
+        )
+
+        response = self.post('select_cards', {'card_numbers': [1, 2, 3, 4, 99]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {result['card_number']: result['status'] for result in response.data['results']},
+            {1: 'taken', 2: 'selected', 3: 'selected', 4: 'insufficient_balance', 99: 'invalid'}
+        )
+        self.assertEqual(response.data['selected'], 2)
+        self.assertEqual(Wallet.objects.get(user=self.player).balance, Decimal('5'))
+        self.assertEqual(Transaction.objects.filter(user=self.player, transaction_type='bet').count(), 2)
+        game_round = GameRound.objects.get(id=self.round.id)
+        self.assertEqual((game_round.total_stake, game_round.selected_cards), (Decimal('20'), 2))
+
+    def test_batch_without_balance_buys_nothing(self):
+        Wallet.objects.create(user=self.player, balance=Decimal('5'))
+
+        response = self.post('select_cards', {'card_numbers': [2, 3]})
+
+        self.assertFalse(response.data['success'])
+        self.assertEqual(Wallet.objects.get(user=self.player).balance, Decimal('5'))
+        self.assertFalse(PlayerSelection.objects.filter(player=self.player).exists())
+
+
+class CardStateTests(SimpleTestCase):
+    def test_marks_and_patterns(self):
+        state = CardState(selection_id=3)
+        for position in WINNING_PATTERNS['row_1']:
+            self.assertTrue(state.mark(position))
+        self.assertFalse(state.mark(0))
+
+        self.assertEqual((state.positions, state.count), ([0, 1, 2, 3, 4], 5))
+        self.assertEqual(state.winning_patterns(), {'row_1': [0, 1, 2, 3, 4]})
+        self.assertTrue(state.has_win())
+
+    def test_free_position_completes_patterns_only_when_asked(self):
+        state = CardState.from_positions(WINNING_PATTERNS['diagonal_1'] - {FREE_POSITION})
+        self.assertFalse(state.has_win())
+        self.assertEqual(list(state.winning_patterns(with_free=True)), ['diagonal_1'])
+
+
+class CallLogTests(SimpleTestCase):
+    def setUp(self):
+        self.started = timezone.now()
+        self.log = CallLog()
+        for seconds, number in ((0, 5), (2, 70), (4, 33)):
+            self.log.append(number, self.started + timedelta(seconds=seconds))
+
+    def test_append_and_read_back(self):
+        self.assertEqual((len(self.log), self.log.to_list()), (3, [5, 70, 33]))
+        self.assertEqual(self.log.called_at(1), self.started + timedelta(seconds=2))
+        self.assertEqual(self.log.last_call_at, self.started + timedelta(seconds=4))
+
+        # Survives the round's fields
+        fields = self.log.fields()
+        copy = CallLog(fields['call_log'], fields['call_offsets'], fields['call_log_started_at'])
+        self.assertEqual(copy.called_at(-1), self.log.last_call_at)
+
+    def test_recent_and_since(self):
+        self.assertEqual(
+            [(call['id'], call['letter'], call['number']) for call in self.log.recent(2)],
+            [(3, 'N', 33), (2, 'O', 70)]
+        )
+        self.assertEqual([call['number'] for call in self.log.since(self.started + timedelta(seconds=1))], [70, 33])
+        self.assertEqual(len(self.log.since(None)), 3)
+
+    def test_full_log_refuses_calls(self):
+        log = CallLog()
+        for number in range(1, 76):
+            log.append(number, self.started)
+        with self.assertRaises(ValueError):
+            log.append(1, self.started)
+
+
+class LocalCacheTests(SimpleTestCase):
+    def test_cached_none_is_not_a_miss(self):
+        local = LocalCache()
+        local.set('key', None)
+        self.assertIsNone(local.get('key', MISSING))
+        self.assertIs(local.get('other', MISSING), MISSING)
+
+    def test_entries_expire(self):
+        local = LocalCache(ttl=60)
+        local.set('key', 'value', ttl=-1)
+        self.assertIs(local.get('key', MISSING), MISSING)
+        # peek still sees an expired entry
+        local.set('key', 'value', ttl=-1)
+        self.assertEqual(local.peek('key'), 'value')
+
+    def test_least_recently_used_goes_first(self):
+        local = LocalCache(max_entries=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertEqual(('a' in local, 'b' in local, 'c' in local), (True, False, True))
+
+
+class EncodeBitmapTests(SimpleTestCase):
+    def test_bit_per_card_number(self):
+        self.assertEqual(base64.b64decode(encode_bitmap([1, 8, 9])), bytes([0b10000001, 0b00000001]))
+        self.assertEqual(len(base64.b64decode(encode_bitmap([200]))), 25)
+
+    def test_empty_and_invalid_numbers(self):
+        self.assertEqual(encode_bitmap([]), '')
+        self.assertEqual(encode_bitmap([None, 0, -3]), '')
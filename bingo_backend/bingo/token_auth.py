@@ -0,0 +1,50 @@
+# bingo/token_auth.py
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def user_for_token(raw_token):
+    """User of a simplejwt access token, None if the token is missing or invalid"""
+    if not raw_token:
+        return None
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except APIException:
+        return None
+
+
+def token_from_query_string(query_string):
+    """Access token of a ?token=<JWT> query string (str or bytes), None if absent"""
+    if isinstance(query_string, bytes):
+        query_string = query_string.decode('latin-1')
+    values = parse_qs(query_string).get('token')
+    return values[0] if values else None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Channels middleware authenticating a WebSocket from ?token=<JWT access token>
+
+    Browsers can't set an Authorization header on a WebSocket, the frontend
+    passes the access token it keeps in localStorage in the URL instead.
+    A valid token replaces the session user set by AuthMiddlewareStack,
+    without one the session user is kept.
+    """
+
+    async def __call__(self, scope, receive, send):
+        token = token_from_query_string(scope.get('query_string', b''))
+        if token:
+            user = await database_sync_to_async(user_for_token)(token)
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    """Session authentication plus ?token= JWT authentication"""
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
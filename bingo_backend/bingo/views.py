@@ -1,15 +1,38 @@
 # bingo/views.py
 from django.db import transaction as db_transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.core.cache import cache
 from django.contrib.auth.decorators import login_required
 from rest_framework import status, viewsets, generics
 from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.exceptions import APIException
+from django.db.models import F, Case, When, Value, Exists, OuterRef, Subquery
+from django.db import IntegrityError
 from datetime import timedelta
 import json
 from .models import GameRound, BingoCard, PlayerSelection, CalledNumber
+from .card_catalogue import CardCatalogue
+from .call_log import CallLog
+from .round_document import get_round_document
+from .taken_cards import get_taken_bitmap, store_taken_bitmap, get_card_owners
+from .current_round import get_current_round, store_current_round
+from .token_auth import user_for_token
+from .card_holds import (
+    CARD_HOLD_SECONDS, reserve_card, release_card, card_holders, held_by_other
+)
+from .events import (
+    publish_round_event, current_round_snapshot, letter_for, round_group, LOBBY_GROUP
+)
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse, HttpResponseNotModified
+import asyncio
 from .serializers import (
     BingoCardSerializer, 
     GameRoundSerializer, 
@@ -41,6 +64,10 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+# Server-Sent Events
+SSE_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MS = 2000
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def run_game_engine_command(request):
@@ -105,6 +132,7 @@ class GameRoundViewSet(viewsets.ModelViewSet):
                 status='waiting',
                 selection_end_time=timezone.now() + timedelta(seconds=60)
             )
+            db_transaction.on_commit(store_current_round)
         
         serializer = self.get_serializer(current_round)
         return Response(serializer.data)
@@ -119,108 +147,365 @@ class GameRoundViewSet(viewsets.ModelViewSet):
         """Deselect a bingo card"""
         return self.handle_card_selection(request, pk, select=False)
     
-    def handle_card_selection(self, request, round_id, select=True):
-        """Handle card selection/deselection"""
+    @action(detail=True, methods=['post'])
+    def select_cards(self, request, pk=None):
+        """Select several bingo cards in one request"""
+        return self.handle_batch_selection(request, pk)
+    
+    @action(detail=True, methods=['post'])
+    def reserve_card(self, request, pk=None):
+        """Hold a card for a few seconds before buying it
+        
+        One query checks the round is open for selection and the card still
+        free, the hold itself lives in the cache only.
+        """
         try:
-            game_round = GameRound.objects.get(id=round_id)
-        except GameRound.DoesNotExist:
-            return Response({'error': 'Game round not found'}, status=404)
+            card = CardCatalogue.get(int(request.data.get('card_number')))
+        except (TypeError, ValueError):
+            card = None
+        if card is None or not card.is_active:
+            return Response({'error': 'Invalid card number'}, status=400)
         
-        if game_round.status != 'waiting':
+        game_round = GameRound.objects.filter(id=pk).annotate(
+            card_taken=Exists(PlayerSelection.objects.filter(
+                game_round_id=OuterRef('pk'),
+                bingo_card_id=card.id
+            ))
+        ).values('status', 'card_taken').first()
+        if game_round is None:
+            return Response({'error': 'Game round not found'}, status=404)
+        if game_round['status'] != 'waiting':
             return Response({'error': 'Selection period ended'}, status=400)
+        if game_round['card_taken']:
+            return Response({'error': 'Card already taken'}, status=400)
+        
+        holder = reserve_card(pk, card.card_number, request.user.id)
+        if holder != request.user.id:
+            return Response({'error': 'Card reserved by another player'}, status=409)
         
+        return Response({
+            'success': True,
+            'card_number': card.card_number,
+            'expires_in': CARD_HOLD_SECONDS
+        })
+    
+    @action(detail=True, methods=['post'])
+    def release_card(self, request, pk=None):
+        """Give up a reserved card without buying it"""
+        try:
+            card_number = int(request.data.get('card_number'))
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid card number'}, status=400)
+        
+        release_card(pk, card_number, request.user.id)
+        return Response({'success': True, 'card_number': card_number})
+    
+    def handle_card_selection(self, request, round_id, select=True):
+        """Handle card selection/deselection
+        
+        A handful of statements per click: the wallet UPDATE comes first,
+        its row lock serializes the player's own requests (single and batch)
+        so the new / leaving player check in the round UPDATE sees their
+        committed cards. The card is claimed by the (game_round, bingo_card)
+        unique constraint and the round row is only touched by the final F()
+        UPDATE, which also checks the round is still open for selection.
+        """
         card_number = request.data.get('card_number')
         if not card_number:
             return Response({'error': 'Card number required'}, status=400)
         
         try:
-            bingo_card = BingoCard.objects.get(card_number=card_number)
-        except BingoCard.DoesNotExist:
+            bingo_card = CardCatalogue.get(int(card_number))
+        except (TypeError, ValueError):
+            bingo_card = None
+        if bingo_card is None:
             return Response({'error': 'Invalid card number'}, status=400)
         
+        # Another player's hold wins without a trip to the database
+        if select and held_by_other(round_id, bingo_card.card_number, request.user.id):
+            return Response({'error': 'Card reserved by another player'}, status=409)
+        
+        bet_amount = 10  # Fixed bet amount
+        
+        # The player's other cards in this round, evaluated inside the round UPDATE
+        other_cards = PlayerSelection.objects.filter(
+            game_round_id=OuterRef('pk'),
+            player=request.user
+        )
+        
+        try:
+            with db_transaction.atomic():
+                if select:
+                    # Debit only if the balance covers the bet, locks the player's wallet row
+                    debited = Wallet.objects.filter(
+                        user=request.user,
+                        balance__gte=bet_amount
+                    ).update(balance=F('balance') - bet_amount)
+                    if not debited:
+                        db_transaction.set_rollback(True)
+                        return Response({'error': 'Insufficient balance'}, status=400)
+                    
+                    # Claim the card, a taken card fails on the unique constraint
+                    selection = PlayerSelection.objects.create(
+                        game_round_id=round_id,
+                        player=request.user,
+                        bingo_card_id=bingo_card.id
+                    )
+                    
+                    Transaction.objects.create(
+                        user=request.user,
+                        transaction_type='bet',
+                        amount=bet_amount,
+                        game_round_id=round_id,
+                        description=f'Bet for card #{card_number}'
+                    )
+                    
+                    # Stake and counters, first card of the player counts a new player
+                    updated = GameRound.objects.filter(id=round_id, status='waiting').update(
+                        total_stake=F('total_stake') + bet_amount,
+                        selected_cards=F('selected_cards') + 1,
+                        player_count=F('player_count') + Case(
+                            When(Exists(other_cards.exclude(id=selection.id)), then=Value(0)),
+                            default=Value(1)
+                        ),
+                        version=F('version') + 1
+                    )
+                    
+                    message = f'Card #{card_number} selected'
+                else:
+                    # Refund to wallet first, locks the player's wallet row
+                    Wallet.objects.filter(user=request.user).update(
+                        balance=F('balance') + bet_amount
+                    )
+                    
+                    # Deselect card
+                    deleted, _ = PlayerSelection.objects.filter(
+                        game_round_id=round_id,
+                        player=request.user,
+                        bingo_card_id=bingo_card.id
+                    ).delete()
+                    if not deleted:
+                        db_transaction.set_rollback(True)
+                        return Response({'error': 'Card not selected by you'}, status=400)
+                    
+                    # Create refund transaction
+                    Transaction.objects.create(
+                        user=request.user,
+                        transaction_type='refund',
+                        amount=bet_amount,
+                        game_round_id=round_id,
+                        description=f'Refund for card #{card_number}'
+                    )
+                    
+                    # Stake and counters, the player's last card removes the player
+                    updated = GameRound.objects.filter(id=round_id, status='waiting').update(
+                        total_stake=F('total_stake') - bet_amount,
+                        selected_cards=F('selected_cards') - 1,
+                        player_count=F('player_count') - Case(
+                            When(Exists(other_cards), then=Value(0)),
+                            default=Value(1)
+                        ),
+                        version=F('version') + 1
+                    )
+                    
+                    message = f'Card #{card_number} deselected'
+                
+                if not updated:
+                    # Round missing or no longer taking selections, undo everything
+                    db_transaction.set_rollback(True)
+        except IntegrityError:
+            # Card already claimed in this round (or the round doesn't exist)
+            if not GameRound.objects.filter(id=round_id).exists():
+                return Response({'error': 'Game round not found'}, status=404)
+            return Response({'error': 'Card already taken'}, status=400)
+        
+        if not updated:
+            if not GameRound.objects.filter(id=round_id).exists():
+                return Response({'error': 'Game round not found'}, status=404)
+            return Response({'error': 'Selection period ended'}, status=400)
+        
+        # New totals and the player's balance in one read
+        game_round = GameRound.objects.only(
+            'id', 'total_stake', 'player_count', 'selected_cards', 'version'
+        ).annotate(
+            wallet_balance=Subquery(
+                Wallet.objects.filter(user=request.user).values('balance')[:1]
+            )
+        ).get(id=round_id)
+        
+        # Push the new count and bitmap once the selection is committed
+        if select:
+            db_transaction.on_commit(
+                lambda: release_card(round_id, bingo_card.card_number, request.user.id)
+            )
+        db_transaction.on_commit(lambda: store_taken_bitmap(game_round.id))
+        db_transaction.on_commit(store_current_round)
+        db_transaction.on_commit(lambda: publish_player_count(game_round))
+        
+        return Response({
+            'success': True,
+            'message': message,
+            'wallet_balance': float(game_round.wallet_balance or 0),
+            'total_stake': float(game_round.total_stake)
+        })
+
+    def handle_batch_selection(self, request, round_id):
+        """Buy every available card of request.data['card_numbers'] in one transaction
+        
+        One wallet lock and debit for all cards, selections and bet
+        transactions written with bulk_create, one round UPDATE. Returns a
+        result per requested card: selected, taken, reserved, invalid or
+        insufficient_balance.
+        """
+        card_numbers = request.data.get('card_numbers')
+        if not isinstance(card_numbers, list) or not card_numbers:
+            return Response({'error': 'card_numbers list required'}, status=400)
+        
         bet_amount = 10  # Fixed bet amount
         
+        # Requested cards in order, duplicates dropped
+        results = {}
+        cards = []
+        for card_number in card_numbers:
+            try:
+                card_number = int(card_number)
+            except (TypeError, ValueError):
+                results.setdefault(str(card_number), 'invalid')
+                continue
+            if card_number in results:
+                continue
+            card = CardCatalogue.get(card_number)
+            if card is None or not card.is_active:
+                results[card_number] = 'invalid'
+            else:
+                results[card_number] = None
+                cards.append(card)
+        
+        # Cards held by other players are left out
+        holders = card_holders(round_id, [card.card_number for card in cards])
+        for card in cards:
+            if holders.get(card.card_number, request.user.id) != request.user.id:
+                results[card.card_number] = 'reserved'
+        cards = [card for card in cards if results[card.card_number] is None]
+        
         with db_transaction.atomic():
-            wallet = Wallet.objects.select_for_update().get(user=request.user)
+            # The player's one lock for the whole batch
+            wallet = Wallet.objects.select_for_update().filter(user=request.user).first()
+            balance = wallet.balance if wallet else 0
             
-            if select:
-                # Check if card already taken
-                if PlayerSelection.objects.filter(game_round=game_round, bingo_card=bingo_card).exists():
-                    return Response({'error': 'Card already taken'}, status=400)
-                
-                # Check wallet balance
-                if wallet.balance < bet_amount:
-                    return Response({'error': 'Insufficient balance'}, status=400)
-                
-                # Deduct from wallet
-                wallet.balance -= bet_amount
-                wallet.save()
-                
-                # Create transaction
-                Transaction.objects.create(
-                    user=request.user,
-                    transaction_type='bet',
-                    amount=bet_amount,
-                    game_round=game_round,
-                    description=f'Bet for card #{card_number}'
-                )
-                
-                # Update game stake
-                game_round.total_stake += bet_amount
-                game_round.save()
+            taken = set(PlayerSelection.objects.filter(
+                game_round_id=round_id,
+                bingo_card_id__in=[card.id for card in cards]
+            ).values_list('bingo_card_id', flat=True))
+            
+            buying = []
+            for card in cards:
+                if card.id in taken:
+                    results[card.card_number] = 'taken'
+                elif (len(buying) + 1) * bet_amount > balance:
+                    results[card.card_number] = 'insufficient_balance'
+                else:
+                    buying.append(card)
+            
+            if buying:
+                # Claim all cards at once, cards another player took meanwhile are skipped
+                PlayerSelection.objects.bulk_create([
+                    PlayerSelection(
+                        game_round_id=round_id,
+                        player=request.user,
+                        bingo_card_id=card.id
+                    ) for card in buying
+                ], ignore_conflicts=True)
                 
-                # Create player selection
-                PlayerSelection.objects.create(
-                    game_round=game_round,
+                # The wallet lock keeps the player's other requests out, their cards here are this batch's
+                claimed = set(PlayerSelection.objects.filter(
+                    game_round_id=round_id,
                     player=request.user,
-                    bingo_card=bingo_card
-                )
-                
-                message = f'Card #{card_number} selected'
-            else:
-                # Deselect card
-                try:
-                    selection = PlayerSelection.objects.get(
-                        game_round=game_round,
-                        player=request.user,
-                        bingo_card=bingo_card
-                    )
-                except PlayerSelection.DoesNotExist:
-                    return Response({'error': 'Card not selected by you'}, status=400)
+                    bingo_card_id__in=[card.id for card in buying]
+                ).values_list('bingo_card_id', flat=True))
+                for card in buying:
+                    if card.id not in claimed:
+                        results[card.card_number] = 'taken'
+                buying = [card for card in buying if card.id in claimed]
+            
+            if buying:
+                total = bet_amount * len(buying)
+                Wallet.objects.filter(id=wallet.id).update(balance=F('balance') - total)
                 
-                # Refund to wallet
-                wallet.balance += bet_amount
-                wallet.save()
+                Transaction.objects.bulk_create([
+                    Transaction(
+                        user=request.user,
+                        transaction_type='bet',
+                        amount=bet_amount,
+                        game_round_id=round_id,
+                        description=f'Bet for card #{card.card_number}'
+                    ) for card in buying
+                ])
                 
-                # Create refund transaction
-                Transaction.objects.create(
-                    user=request.user,
-                    transaction_type='refund',
-                    amount=bet_amount,
-                    game_round=game_round,
-                    description=f'Refund for card #{card_number}'
+                # Stake and counters in one statement, the player is new unless they held a card before
+                other_cards = PlayerSelection.objects.filter(
+                    game_round_id=OuterRef('pk'),
+                    player=request.user
+                ).exclude(bingo_card_id__in=[card.id for card in buying])
+                updated = GameRound.objects.filter(id=round_id, status='waiting').update(
+                    total_stake=F('total_stake') + total,
+                    selected_cards=F('selected_cards') + len(buying),
+                    player_count=F('player_count') + Case(
+                        When(Exists(other_cards), then=Value(0)),
+                        default=Value(1)
+                    ),
+                    version=F('version') + 1
                 )
+                if not updated:
+                    db_transaction.set_rollback(True)
                 
-                # Update game stake
-                game_round.total_stake -= bet_amount
-                game_round.save()
-                
-                # Delete selection
-                selection.delete()
-                
-                message = f'Card #{card_number} deselected'
-            
-            # Clear player count cache
-            cache_key = f'player_count_round_{game_round.id}'
-            cache.delete(cache_key)
+                for card in buying:
+                    results[card.card_number] = 'selected'
+        
+        if buying and not updated:
+            if not GameRound.objects.filter(id=round_id).exists():
+                return Response({'error': 'Game round not found'}, status=404)
+            return Response({'error': 'Selection period ended'}, status=400)
+        
+        game_round = GameRound.objects.only(
+            'id', 'total_stake', 'player_count', 'selected_cards', 'version'
+        ).annotate(
+            wallet_balance=Subquery(
+                Wallet.objects.filter(user=request.user).values('balance')[:1]
+            )
+        ).filter(id=round_id).first()
+        if game_round is None:
+            return Response({'error': 'Game round not found'}, status=404)
+        
+        if buying:
+            held = [card.card_number for card in buying if card.card_number in holders]
+            db_transaction.on_commit(
+                lambda: [release_card(round_id, n, request.user.id) for n in held]
+            )
+            db_transaction.on_commit(lambda: store_taken_bitmap(game_round.id))
+            db_transaction.on_commit(store_current_round)
+            db_transaction.on_commit(lambda: publish_player_count(game_round))
         
         return Response({
-            'success': True,
-            'message': message,
-            'wallet_balance': float(wallet.balance),
+            'success': bool(buying),
+            'selected': len(buying),
+            'results': [
+                {'card_number': card_number, 'status': result}
+                for card_number, result in results.items()
+            ],
+            'wallet_balance': float(game_round.wallet_balance or 0),
             'total_stake': float(game_round.total_stake)
         })
 
+def publish_player_count(game_round):
+    """Push the player count of a round to its listeners"""
+    publish_round_event(
+        game_round.id, 'player_count',
+        player_count=game_round.player_count,
+        selected_cards=game_round.selected_cards,
+        total_stake=game_round.total_stake
+    )
+
 class BingoCardViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = BingoCardSerializer
     permission_classes = [IsAuthenticated]
@@ -235,71 +520,63 @@ class BingoCardViewSet(viewsets.ReadOnlyModelViewSet):
             status__in=['waiting', 'active']
         ).order_by('-round_number').first()
         context['game_round'] = current_round
+        # card id -> owner for the whole list, instead of two queries per card
+        context['card_owners'] = get_card_owners(current_round) if current_round else {}
         return context
 
 # API Views
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def game_status(request):
-    """Get complete game status for polling"""
+    """Get complete game status for polling
+    
+    The current round comes from the shared current-round entry and the
+    round itself from the shared per-version round document, only the
+    player's cards and wallet are read per request.
+    """
     # Get current game round
-    current_round = GameRound.objects.filter(
-        status__in=['waiting', 'active']
-    ).order_by('-round_number').first()
+    current_round = get_current_round()
     
-    if not current_round:
+    if not current_round or current_round.status not in ('waiting', 'active'):
         return Response({'error': 'No active game'}, status=404)
     
     # Get player's selections
     player_selections = PlayerSelection.objects.filter(
-        game_round=current_round,
+        game_round_id=current_round.id,
         player=request.user
     )
     
-    # Get recent calls (last 4)
-    recent_calls = CalledNumber.objects.filter(
-        game_round=current_round
-    ).order_by('-called_at')[:4]
+    # Round fields, recent calls and winner from the shared round document, computed once per version
+    document = get_round_document(current_round)
+    round_data = document['round']
     
     # Get wallet
     wallet = Wallet.objects.get(user=request.user)
     
-    # Get player count
-    cache_key = f'player_count_round_{current_round.id}'
-    player_count = cache.get(cache_key)
-    
-    if player_count is None:
-        player_count = current_round.selections.values('player').distinct().count()
-        cache.set(cache_key, player_count, 5)
-    
     # Get time remaining
-    time_remaining = 0
-    if current_round.status == 'waiting' and current_round.selection_end_time:
-        now = timezone.now()
-        if now < current_round.selection_end_time:
-            time_remaining = int((current_round.selection_end_time - now).total_seconds())
+    time_remaining = selection_time_remaining(round_data)
     
     # Check if user has any winning cards
     user_won = False
     winning_card = None
-    if current_round.status == 'finished' and current_round.winner == request.user:
+    if round_data['status'] == 'finished' and round_data['winner_id'] == request.user.id:
         user_won = True
-        winning_card = current_round.winning_card.card_number if current_round.winning_card else None
+        winning_card = round_data['winning_card']
     
     data = {
         'round': {
-            'id': current_round.id,
-            'round_number': current_round.round_number,
-            'status': current_round.status,
-            'total_stake': float(current_round.total_stake),
+            'id': round_data['id'],
+            'round_number': round_data['round_number'],
+            'status': round_data['status'],
+            'total_stake': round_data['total_stake'],
             'time_remaining': time_remaining,
-            'called_numbers': current_round.called_numbers,
-            'selection_end_time': current_round.selection_end_time.isoformat() if current_round.selection_end_time else None,
-            'start_time': current_round.start_time.isoformat() if current_round.start_time else None,
-            'winner': current_round.winner.username if current_round.winner else None,
-            'winning_card': current_round.winning_card.card_number if current_round.winning_card else None,
-            'winning_pattern': current_round.winning_pattern,
-            'prize_pool': float(current_round.prize_pool) if current_round.prize_pool else 0,
+            'called_numbers': round_data['called_numbers'],
+            'selection_end_time': round_data['selection_end_time'],
+            'start_time': round_data['start_time'],
+            'winner': round_data['winner'],
+            'winning_card': round_data['winning_card'],
+            'winning_pattern': round_data['winning_pattern'],
+            'prize_pool': round_data['prize_pool'],
         },
         'player': {
             'cards': PlayerSelectionSerializer(player_selections, many=True).data,
@@ -308,28 +585,105 @@ def game_status(request):
             'winning_card': winning_card,
         },
         'game': {
-            'recent_calls': CalledNumberSerializer(recent_calls, many=True).data,
-            'player_count': player_count,
+            'recent_calls': document['game']['recent_calls'],
+            'player_count': document['game']['player_count'],
             'total_cards': 200,
-            'selected_cards': current_round.selections.count(),
+            'selected_cards': document['game']['selected_cards'],
         },
         'timestamp': timezone.now().isoformat(),
     }
     
     return Response(data)
+
+def selection_time_remaining(round_data):
+    """Whole seconds left to pick cards, from a round document's round part"""
+    if round_data['status'] != 'waiting' or not round_data['selection_end_time']:
+        return 0
+    remaining = (parse_datetime(round_data['selection_end_time']) - timezone.now()).total_seconds()
+    return max(int(remaining), 0)
+
+def round_delta(round_data, user, since):
+    """Calls and mark changes of an active round since version `since`.
+    
+    round_data is the round part of the round document. Returns None when
+    the client needs the full status instead: the round isn't active, or
+    the client hasn't seen it go active yet.
+    """
+    if round_data['status'] != 'active':
+        return None
+    
+    # While active the version only moves with calls, the round went
+    # active at version - len(called) and call i was made at that + i + 1
+    called = round_data['called_numbers']
+    active_version = round_data['version'] - len(called)
+    if since < active_version or since > round_data['version']:
+        return None
+    
+    new_numbers = called[since - active_version:]
+    
+    # Every card holding a called number gets it marked
+    marks = {}
+    selections = PlayerSelection.objects.filter(
+        game_round_id=round_data['id'],
+        player=user,
+        is_active=True
+    ).values_list('id', 'bingo_card_id')
+    for selection_id, card_id in selections:
+        card = CardCatalogue.get_by_id(card_id)
+        if card is None:
+            continue
+        numbers = [number for number in new_numbers if number in card.positions]
+        if numbers:
+            marks[selection_id] = {
+                'positions': [card.positions[number] for number in numbers],
+                'numbers': numbers,
+            }
+    
+    return {
+        'round': {
+            'id': round_data['id'],
+            'status': round_data['status'],
+            'round_number': round_data['round_number'],
+            'version': round_data['version'],
+        },
+        'delta': {
+            'since': since,
+            'called_numbers': new_numbers,
+            'marks': marks,
+        },
+        'timestamp': timezone.now().isoformat(),
+    }
+
 # bingo/views.py - Add this efficient status endpoint
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def lightweight_status(request):
-    """Lightweight status endpoint for frequent polling"""
+    """Lightweight status endpoint for frequent polling
+    
+    The current round comes from the shared current-round entry and the
+    round part from the shared per-version round document, only the
+    player's cards and wallet are read per request.
+    
+    With ?since=<version> (the round version of the previous response) an
+    unchanged round answers 304 with no body and no query, and an active
+    round answers with only the calls and card marks made since.
+    """
     try:
-        cache_key = f'lightweight_status_{request.user.id}'
-        cached = cache.get(cache_key)
-        
         # Get current round info
-        current_round = GameRound.objects.filter(
-            status__in=['waiting', 'active', 'finished']
-        ).order_by('-round_number').first()
+        current_round = get_current_round()
+        
+        try:
+            since = int(request.GET['since'])
+        except (KeyError, ValueError):
+            since = None
+        
+        if current_round and since is not None:
+            if since == current_round.version:
+                return Response(status=status.HTTP_304_NOT_MODIFIED)
+            
+            delta = round_delta(get_round_document(current_round)['round'], request.user, since)
+            if delta is not None:
+                return Response(delta)
         
         if not current_round:
             data = {
@@ -348,90 +702,55 @@ def lightweight_status(request):
                 },
                 'timestamp': timezone.now().isoformat(),
             }
-            cache.set(cache_key, data, 5)
             return Response(data)
         
+        # Shared part, one build per round version
+        document = get_round_document(current_round)
+        
         # Get or create wallet for user
         wallet, created = Wallet.objects.get_or_create(
             user=request.user,
             defaults={'balance': 100.00}
         )
         
+        round_data = document['round']
+        
         # Get user's selections for this round
         user_selections = PlayerSelection.objects.filter(
-            game_round=current_round,
+            game_round_id=current_round.id,
             player=request.user,
             is_active=True
         )
         
-        # Get player count
-        player_count_cache_key = f'player_count_round_{current_round.id}'
-        player_count = cache.get(player_count_cache_key)
-        
-        if player_count is None:
-            player_count = current_round.selections.filter(is_active=True).values('player').distinct().count()
-            cache.set(player_count_cache_key, player_count, 5)
-        
-        # Get recent calls
-        recent_calls = CalledNumber.objects.filter(
-            game_round=current_round
-        ).order_by('-called_at')[:4]
-        
         # Calculate time remaining for selection
-        time_remaining = 0
-        if current_round.status == 'waiting' and current_round.selection_end_time:
-            now = timezone.now()
-            if now < current_round.selection_end_time:
-                time_remaining = int((current_round.selection_end_time - now).total_seconds())
+        time_remaining = selection_time_remaining(round_data)
         
         # Check if user is winner
-        is_winner = current_round.winner_id == request.user.id if current_round.winner_id else False
+        is_winner = round_data['winner_id'] == request.user.id if round_data['winner_id'] else False
         user_won = False
-        winning_card = None
+        winning_card = round_data['winning_card']
         
-        if current_round.status == 'finished' and current_round.winner_id == request.user.id:
+        if round_data['status'] == 'finished' and round_data['winner_id'] == request.user.id:
             user_won = True
-            winning_card = current_round.winning_card.card_number if current_round.winning_card else None
         
         # Check if user has winning card
         user_has_winning_card = False
-        if current_round.winning_card and user_selections.filter(bingo_card=current_round.winning_card).exists():
+        if winning_card and user_selections.filter(bingo_card__card_number=winning_card).exists():
             user_has_winning_card = True
         
         # Prepare data
         data = {
-            'round': {
-                'id': current_round.id,
-                'status': current_round.status,
-                'round_number': current_round.round_number,
-                'called_numbers': current_round.called_numbers or [],
-                'time_remaining': time_remaining,
-                'total_stake': float(current_round.total_stake),
-                'winner': current_round.winner.username if current_round.winner else None,
-                'winner_id': current_round.winner_id,
-                'winning_card': current_round.winning_card.card_number if current_round.winning_card else None,
-                'winning_pattern': current_round.winning_pattern,
-                'prize_pool': float(current_round.prize_pool) if current_round.prize_pool else 0,
-                'selection_end_time': current_round.selection_end_time.isoformat() if current_round.selection_end_time else None,
-                'start_time': current_round.start_time.isoformat() if current_round.start_time else None,
-                'end_time': current_round.end_time.isoformat() if current_round.end_time else None,
-            },
+            'round': dict(round_data, time_remaining=time_remaining),
             'player': {
                 'cards': PlayerSelectionSerializer(user_selections, many=True).data,
                 'wallet_balance': float(wallet.balance),
                 'has_won': user_won or is_winner or user_has_winning_card,
-                'winning_card': winning_card or (current_round.winning_card.card_number if current_round.winning_card else None),
-            },
-            'game': {
-                'recent_calls': CalledNumberSerializer(recent_calls, many=True).data,
-                'player_count': player_count,
-                'total_cards': 200,
-                'selected_cards': current_round.selections.filter(is_active=True).count(),
+                'winning_card': winning_card,
             },
+            'game': document['game'],
             'timestamp': timezone.now().isoformat(),
         }
         
-        cache.set(cache_key, data, 2)  # Cache for 2 seconds
         return Response(data)
         
     except Exception as e:
@@ -475,17 +794,13 @@ def poll_updates(request):
     if last_poll:
         try:
             last_poll_time = timezone.datetime.fromisoformat(last_poll.replace('Z', '+00:00'))
-            new_numbers = CalledNumber.objects.filter(
-                game_round=current_round,
-                called_at__gt=last_poll_time
-            ).order_by('called_at')
             
-            for number in new_numbers:
+            for call in CallLog.from_round(current_round).since(last_poll_time):
                 updates.append({
                     'type': 'new_number',
-                    'letter': number.letter,
-                    'number': number.number,
-                    'timestamp': number.called_at.isoformat()
+                    'letter': call['letter'],
+                    'number': call['number'],
+                    'timestamp': call['called_at']
                 })
         except:
             pass
@@ -500,25 +815,16 @@ def poll_updates(request):
         })
     elif current_round.status == 'active' and not last_poll:
         # If first poll and game is active, send current called numbers
-        recent_numbers = CalledNumber.objects.filter(
-            game_round=current_round
-        ).order_by('-called_at')[:4]
-        
-        for number in recent_numbers:
+        for call in CallLog.from_round(current_round).recent(4):
             updates.append({
                 'type': 'current_number',
-                'letter': number.letter,
-                'number': number.number,
-                'timestamp': number.called_at.isoformat()
+                'letter': call['letter'],
+                'number': call['number'],
+                'timestamp': call['called_at']
             })
     
     # Check for player count changes
-    cache_key = f'player_count_round_{current_round.id}'
-    player_count = cache.get(cache_key)
-    
-    if player_count is None:
-        player_count = current_round.selections.values('player').distinct().count()
-        cache.set(cache_key, player_count, 5)
+    player_count = current_round.player_count
     
     updates.append({
         'type': 'player_count',
@@ -531,6 +837,184 @@ def poll_updates(request):
         'timestamp': timezone.now().isoformat()
     })
 
+def _sse_event(event_id, payload):
+    """One Server-Sent Events frame"""
+    data = json.dumps(payload, cls=DjangoJSONEncoder)
+    return f"id: {event_id}\nevent: {payload['type']}\ndata: {data}\n\n"
+
+
+def _parse_last_event_id(value):
+    """Last-Event-ID is '<round_id>:<called count>', returns (round_id, count) or (None, 0)"""
+    try:
+        round_id, count = value.split(':')
+        return int(round_id), int(count)
+    except (AttributeError, ValueError):
+        return None, 0
+
+
+def _authenticate(request):
+    """User of a plain Django request through the API's authentication classes (JWT, session)
+    
+    A browser EventSource can't send an Authorization header, so the JWT
+    access token is also accepted as ?token=<access token>.
+    """
+    try:
+        user = Request(request, authenticators=[
+            authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ]).user
+    except APIException:
+        user = None
+    if user is None or not user.is_authenticated:
+        user = user_for_token(request.GET.get('token'))
+    return user if user and user.is_authenticated else None
+
+
+# Async views can't run inside ATOMIC_REQUESTS, the stream opens no transaction of its own
+@db_transaction.non_atomic_requests
+async def game_events_stream(request):
+    """Server-Sent Events fallback of the game WebSocket (ws/game/).
+    
+    Streams the same events as GameConsumer over one long-lived response.
+    Event ids are '<round_id>:<called count>', so a client reconnecting with
+    Last-Event-ID only gets the numbers called since. Same authentication
+    as the polling endpoints it replaces, plus ?token=<JWT access token>
+    for browser EventSource clients (new EventSource('/api/events/?token=...')).
+    """
+    user = await database_sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return JsonResponse({'error': 'Live events are not available'}, status=503)
+    
+    last_round_id, last_count = _parse_last_event_id(
+        request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    )
+    
+    async def stream():
+        channel_name = await channel_layer.new_channel()
+        round_id = None
+        count = 0
+        await channel_layer.group_add(LOBBY_GROUP, channel_name)
+        
+        try:
+            # Tell the client how long to wait before reconnecting
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            
+            snapshot = await database_sync_to_async(current_round_snapshot)()
+            if snapshot:
+                round_id = snapshot['round_id']
+                called = snapshot['called_numbers']
+                await channel_layer.group_add(round_group(round_id), channel_name)
+                
+                if round_id == last_round_id and last_count <= len(called):
+                    # Resume: only what was called since the last event seen
+                    count = last_count
+                    for number in called[last_count:]:
+                        count += 1
+                        yield _sse_event(f"{round_id}:{count}", {
+                            'type': 'number_called',
+                            'round_id': round_id,
+                            'number': number,
+                            'letter': letter_for(number),
+                            'called_count': count,
+                        })
+                else:
+                    count = len(called)
+                    yield _sse_event(f"{round_id}:{count}", snapshot)
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        channel_layer.receive(channel_name), SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line, keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                payload = message.get('payload') or {}
+                
+                # Follow the round the engine opened, like GameConsumer does
+                if payload.get('type') == 'round_state' and payload.get('status') in ('waiting', 'active'):
+                    if payload['round_id'] != round_id:
+                        if round_id is not None:
+                            await channel_layer.group_discard(round_group(round_id), channel_name)
+                        round_id = payload['round_id']
+                        count = 0
+                        await channel_layer.group_add(round_group(round_id), channel_name)
+                elif payload.get('type') == 'number_called':
+                    count = payload.get('called_count', count + 1)
+                
+                yield _sse_event(f"{round_id}:{count}", payload)
+        finally:
+            await channel_layer.group_discard(LOBBY_GROUP, channel_name)
+            if round_id is not None:
+                await channel_layer.group_discard(round_group(round_id), channel_name)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+@api_view(['GET'])
+def taken_cards(request):
+    """Compact card picker state: a bitmap of taken cards for the current round
+    
+    Bit (card_number - 1) of the base64 'taken' bitmap is set when the card
+    is taken. Card grids never change during a round, fetch them once from
+    'grids_url'. Answers 304 while the round version matches If-None-Match.
+    """
+    current_round = get_current_round()
+    
+    if not current_round or current_round.status not in ('waiting', 'active'):
+        return Response({'round_id': None, 'version': None, 'taken': '', 'count': 0, 'mine': []})
+    
+    etag = f'"taken-{current_round.id}-{current_round.version}"'
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    
+    bitmap = get_taken_bitmap(current_round)
+    
+    mine = []
+    if request.user.is_authenticated:
+        mine = list(PlayerSelection.objects.filter(
+            game_round_id=current_round.id,
+            player=request.user,
+            is_active=True
+        ).values_list('bingo_card__card_number', flat=True))
+    
+    response = Response({
+        'round_id': current_round.id,
+        'version': bitmap['version'],
+        'taken': bitmap['taken'],
+        'count': bitmap['count'],
+        'mine': mine,
+        'total_cards': len(CardCatalogue.all()),
+        'grids_url': f"/api/card-grids/?v={CardCatalogue.version()}",
+    })
+    if bitmap['version'] == current_round.version:
+        response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+def card_grids(request):
+    """Every card grid, keyed by card_number. Immutable per catalogue version (?v=)."""
+    version = CardCatalogue.version()
+    etag = f'"cards-{version}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse({
+            'version': version,
+            'cards': {card.card_number: card.grid for card in CardCatalogue.all()},
+        })
+    response['ETag'] = etag
+    # The URL carries the version, a new catalogue gets a new URL
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 @api_view(['GET'])
 #@permission_classes([IsAuthenticated])
 def available_cards(request):
@@ -542,8 +1026,8 @@ def available_cards(request):
     if not current_round:
         return Response({'cards': []})
     
-    # Get all cards
-    all_cards = BingoCard.objects.filter(is_active=True).order_by('card_number')
+    # Get all cards from the process-wide catalogue
+    all_cards = CardCatalogue.all()
     
     # Get selected cards for this round
     selected_cards = set(PlayerSelection.objects.filter(
@@ -556,16 +1040,24 @@ def available_cards(request):
         player=request.user
     ).values_list('bingo_card__card_number', flat=True))
     
+    # Free cards someone is about to buy
+    holders = card_holders(current_round.id, [
+        card.card_number for card in all_cards if card.card_number not in selected_cards
+    ])
+    
     cards_data = []
     for card in all_cards:
         is_selected = card.card_number in selected_cards
         is_mine = card.card_number in user_cards
+        holder = holders.get(card.card_number)
+        is_reserved = holder is not None and holder != request.user.id
         
         cards_data.append({
             'id': card.id,
             'card_number': card.card_number,
-            'is_available': not is_selected,
-            "numbers":card.numbers,
+            'is_available': not is_selected and not is_reserved,
+            'is_reserved': is_reserved,
+            "numbers":card.grid,
             'is_mine': is_mine,
             'selected_by': 'You' if is_mine else ('Other' if is_selected else None)
         })
@@ -588,11 +1080,6 @@ def player_count(request):
     if not current_round:
         return Response({'player_count': 0})
     
-    cache_key = f'player_count_round_{current_round.id}'
-    player_count = cache.get(cache_key)
-    
-    if player_count is None:
-        player_count = current_round.selections.values('player').distinct().count()
-        cache.set(cache_key, player_count, 5)
+    player_count = current_round.player_count
     
     return Response({'player_count': player_count})
\ No newline at end of file
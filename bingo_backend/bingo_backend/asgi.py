@@ -13,6 +13,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bingo_backend.settings')
 
-application = get_asgi_application()
+# Initialize Django before importing consumers (they import models)
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+
+from bingo.routing import websocket_urlpatterns
+from bingo.token_auth import JWTAuthMiddlewareStack
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(
+        # Session cookie or ?token=<JWT access token>, the frontend keeps its JWT in localStorage
+        JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
 
 
@@ -149,7 +149,7 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Channels configuration
-ASGI_APPLICATION = 'your_project.asgi.application'
+ASGI_APPLICATION = 'bingo_backend.asgi.application'
 
 CHANNEL_LAYERS = {
     'default': {
@@ -297,6 +297,14 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Game engine settings
+# Rounds with at least this many cards check winners with the NumPy batch evaluator (needs numpy).
+# A round holds at most one selection per card (200 with generate_bingo_cards), NumPy wins from ~100
+BINGO_BATCH_EVAL_MIN_CARDS = 100
+# Also export every call as a CalledNumber row. The game only reads GameRound's
+# compact call log, turning this on adds one INSERT per called number
+BINGO_CALL_AUDIT = False
+
 # Session settings
 SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_CACHE_ALIAS = 'default'
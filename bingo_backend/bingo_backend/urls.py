@@ -87,7 +87,10 @@ path('game-engine/start/', game.start_game_engine, name='start_engine'),
 urlpatterns = [
 path('api/status/', game_status, name='game-status'),
     path('api/poll/', poll_updates, name='poll-updates'),
+    path('api/events/', game_events_stream, name='game-events'),
     path('api/available-cards/', available_cards, name='available-cards'),
+    path('api/taken-cards/', taken_cards, name='taken-cards'),
+    path('api/card-grids/', card_grids, name='card-grids'),
     path('api/player-count/', player_count, name='player-count'),
     path('api/lightweight-status/', lightweight_status, name='lightweight_status'),
     path('admin/', admin.site.urls),